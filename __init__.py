@@ -16,41 +16,34 @@ from bpy.types import Operator, Panel
 from bpy.props import StringProperty, BoolProperty
 from bpy.app.handlers import persistent
 import traceback
+import logging
+import ast
+import functools
 import os
 import tempfile
 from pathlib import Path
 
+# Set ELCA_DEBUG in the environment to get verbose registration output
+DEBUG = bool(os.environ.get("ELCA_DEBUG"))
+
+# Logger for the UI hooks; messages are only formatted when the level is enabled
+log = logging.getLogger("elca")
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("[eLCA] %(message)s"))
+    log.addHandler(_log_handler)
+    log.propagate = False
+log.setLevel(logging.DEBUG if DEBUG else logging.WARNING)
+
 print("\n[eLCA] Initializing eLCA Bonsai integration...")
 
 # First, ensure dependencies are installed
 from . import dependencies
 dependencies_installed = dependencies.ensure_dependencies()
 
-# Only import our modules if dependencies are installed
-if dependencies_installed:
-    # Import our modules
-    from . import elca_parser
-    from . import ifc_library_creator
-    from . import material_sets
-else:
-    # Create dummy modules for graceful failure
-    class DummyModule:
-        pass
-    
-    elca_parser = DummyModule()
-    elca_parser.ELCAComponentExtractor = lambda *args, **kwargs: None
-    
-    ifc_library_creator = DummyModule()
-    ifc_library_creator.create_ifc_library_from_bauteil_elements = lambda *args, **kwargs: None
-    ifc_library_creator.attach_library_to_project = lambda *args, **kwargs: None
-    
-    material_sets = DummyModule()
-    material_sets.add_material_sets_to_project = lambda *args, **kwargs: None
-    material_sets.add_material_sets_from_library_file = lambda *args, **kwargs: None
-    material_sets.get_material_sets_summary = lambda *args, **kwargs: {}
-    material_sets.remove_material_sets_from_project = lambda *args, **kwargs: None
-    material_sets.validate_material_sets = lambda *args, **kwargs: []
-    material_sets.sync_material_sets_with_ifc = lambda *args, **kwargs: False
+# elca_parser, ifc_library_creator and material_sets (and with them bs4, pandas
+# and ifcopenshell) are imported inside the operators that use them, so enabling
+# the add-on does not pay for modules that are only needed on demand
 
 bl_info = {
     "name": "Elca Bonsai",
@@ -63,6 +56,11 @@ bl_info = {
     "category": "Generic",
 }
 
+def _id_property_dict(data):
+    """Convert a flat dict for storing it as an ID property, which can't hold None or non-string keys"""
+    return {str(key): value if isinstance(value, (int, float, str)) else str(value)
+            for key, value in data.items() if value is not None}
+
 class ELCA_OT_LoadResults(Operator):
     """Load eLCA results from HTML file"""
     bl_idname = "elca.load_results"
@@ -90,6 +88,7 @@ class ELCA_OT_LoadResults(Operator):
             print(f"[eLCA] Loading eLCA results : {self.filepath}")
             
             # Extract components from HTML file only (no XML yet)
+            from . import elca_parser
             extractor = elca_parser.ELCAComponentExtractor(self.filepath)
             bauteil_elements = extractor.extract_bauteil_elements()
             
@@ -154,6 +153,7 @@ class ELCA_OT_LoadProject(Operator):
             
             # Now create extractor with both HTML and XML files
             print(f"[eLCA] Processing both HTML ({html_path}) and XML ({self.filepath}) files")
+            from . import elca_parser
             extractor = elca_parser.ELCAComponentExtractor(html_path, self.filepath)
             
             # Extract building elements with matched layer thicknesses
@@ -183,7 +183,8 @@ class ELCA_OT_LoadProject(Operator):
                 
             #     # Store the matched data
                 context.scene["elca_matched_data"] = "true"
-                context.scene["elca_layer_data"] = str(layer_summary)
+                # Stored as an ID property group, so drawing the panel needs no parsing
+                context.scene["elca_layer_data"] = _id_property_dict(layer_summary)
                 
             else:
                 self.report({'WARNING'}, "No layer thickness data found in XML file")
@@ -311,6 +312,7 @@ class ELCA_OT_CreateIFCLibrary(Operator):
             
             # Create the IFC library with layer thickness data
             print(f"[eLCA] Creating IFC library at: {output_path}")
+            from . import ifc_library_creator
             ifc_file = ifc_library_creator.create_ifc_library_from_bauteil_elements(
                 bauteil_elements, str(output_path))
             
@@ -355,6 +357,10 @@ class ELCA_OT_InstallDependencies(Operator):
     bl_options = {'REGISTER', 'UNDO'}
     
     def execute(self, context):
+        if dependencies_installed:
+            self.report({'INFO'}, "All dependencies are already installed")
+            return {'FINISHED'}
+        
         try:
             success = dependencies.ensure_dependencies()
             if success:
@@ -369,6 +375,20 @@ class ELCA_OT_InstallDependencies(Operator):
             print(traceback.format_exc())
             return {'CANCELLED'}
 
+class ELCA_OT_EnableDebug(Operator):
+    """Toggle verbose eLCA debug output in the system console"""
+    bl_idname = "elca.enable_debug"
+    bl_label = "Toggle eLCA Debug Output"
+    
+    def execute(self, context):
+        if log.isEnabledFor(logging.DEBUG):
+            log.setLevel(logging.WARNING)
+            self.report({'INFO'}, "eLCA debug output disabled")
+        else:
+            log.setLevel(logging.DEBUG)
+            self.report({'INFO'}, "eLCA debug output enabled")
+        return {'FINISHED'}
+
 class ELCA_OT_ShowMaterialSets(Operator):
     """Show summary of material sets in the project"""
     bl_idname = "elca.show_material_sets"
@@ -381,6 +401,7 @@ class ELCA_OT_ShowMaterialSets(Operator):
             return {'CANCELLED'}
             
         try:
+            from . import material_sets
             summary = material_sets.get_material_sets_summary()
             
             if summary:
@@ -391,16 +412,20 @@ class ELCA_OT_ShowMaterialSets(Operator):
                 self.report({'INFO'}, message)
                 print(f"[eLCA] {message}")
                 
-                # Print detailed info to console
+                # Print detailed info to console, collected into a single write
+                lines = []
                 if layer_count > 0:
-                    print("[eLCA] Material Layer Sets:")
-                    for layer_set in summary.get('layer_sets', []):
-                        print(f"  - {layer_set['name']} ({layer_set['layer_count']} layers, {layer_set['total_thickness']}mm thick)")
+                    lines.append("[eLCA] Material Layer Sets:")
+                    lines.extend(f"  - {layer_set['name']} ({layer_set['layer_count']} layers, {layer_set['total_thickness']}mm thick)"
+                                 for layer_set in summary.get('layer_sets', []))
                 
                 if constituent_count > 0:
-                    print("[eLCA] Material Constituent Sets:")
-                    for const_set in summary.get('constituent_sets', []):
-                        print(f"  - {const_set['name']} ({const_set['constituent_count']} constituents)")
+                    lines.append("[eLCA] Material Constituent Sets:")
+                    lines.extend(f"  - {const_set['name']} ({const_set['constituent_count']} constituents)"
+                                 for const_set in summary.get('constituent_sets', []))
+                
+                if lines:
+                    print("\n".join(lines))
             else:
                 self.report({'INFO'}, "No material sets found in project")
                 print("[eLCA] No material sets found in project")
@@ -431,6 +456,7 @@ class ELCA_OT_RemoveMaterialSets(Operator):
             
         try:
             material_type_filter = None if self.material_type == "ALL" else self.material_type
+            from . import material_sets
             material_sets.remove_material_sets_from_project(material_type_filter)
             
             self.report({'INFO'}, f"Removed material sets from project")
@@ -458,6 +484,7 @@ class ELCA_OT_ValidateMaterialSets(Operator):
             return {'CANCELLED'}
             
         try:
+            from . import material_sets
             issues = material_sets.validate_material_sets()
             
             if not issues:
@@ -494,6 +521,7 @@ class ELCA_OT_SyncMaterialSets(Operator):
             return {'CANCELLED'}
             
         try:
+            from . import material_sets
             success = material_sets.sync_material_sets_with_ifc()
             
             if success:
@@ -529,228 +557,251 @@ class ELCA_PT_Panel(Panel):
         if not dependencies_installed:
             box.label(text="Dependencies not installed", icon='ERROR')
             box.operator("elca.install_dependencies", icon='PACKAGE')
-        else:
-            box.label(text="Load eLCA project and results files:")
-            row = box.row()
-            row.operator("elca.load_results", text="1. Load Results (.html / .htm file) (do this first)", icon='SPREADSHEET')
-            
-            row = box.row()
-            row.operator("elca.load_project", text="2. Load Project (.xml File)", icon='IMPORT')
-            
-            
-            # Material Sets section
-            box.separator()
-            box.label(text="Material Sets Management:")
-            
-            row = box.row()
-            row.operator("elca.show_material_sets", text="Show Sets", icon='INFO')
-            
-            row = box.row()
-            row.operator("elca.validate_material_sets", text="Validate", icon='CHECKMARK')
-            
-            row = box.row()
-            row.operator("elca.sync_material_sets", text="Sync with IFC", icon='FILE_REFRESH')
-            
-            row = box.row()
-            row.operator("elca.remove_material_sets", text="Remove All", icon='TRASH')
+            return
+        
+        box.label(text="Load eLCA project and results files:")
+        row = box.row()
+        row.operator("elca.load_results", text="1. Load Results (.html / .htm file) (do this first)", icon='SPREADSHEET')
+        
+        row = box.row()
+        row.operator("elca.load_project", text="2. Load Project (.xml File)", icon='IMPORT')
+        
+        
+        # Material Sets section
+        box.separator()
+        box.label(text="Material Sets Management:")
+        
+        row = box.row()
+        row.operator("elca.show_material_sets", text="Show Sets", icon='INFO')
+        
+        row = box.row()
+        row.operator("elca.validate_material_sets", text="Validate", icon='CHECKMARK')
+        
+        row = box.row()
+        row.operator("elca.sync_material_sets", text="Sync with IFC", icon='FILE_REFRESH')
+        
+        row = box.row()
+        row.operator("elca.remove_material_sets", text="Remove All", icon='TRASH')
+        
+        box.separator()
+        row = box.row()
+        row.operator("elca.enable_debug", text="Toggle Debug Output", icon='CONSOLE')
 
 # Store original draw functions
 _original_draw_functions = {}
 
+# Bonsai panel classes to extend with the eLCA UI, in order of preference
+_TARGET_PANELS = (
+    "bonsai.bim.module.material.ui.BIM_PT_materials",
+    "bonsai.bim.module.material.ui.BIM_PT_object_material",
+)
+
+# Registered panel classes by fully qualified name, built lazily by _panels()
+_PANEL_BY_FQN = None
+
+def _panels():
+    """Return the registered Panel classes indexed by module-qualified name."""
+    global _PANEL_BY_FQN
+    if _PANEL_BY_FQN is None:
+        _PANEL_BY_FQN = {f"{cls.__module__}.{cls.__name__}": cls
+                         for cls in bpy.types.Panel.__subclasses__() if hasattr(cls, '__module__')}
+    return _PANEL_BY_FQN
+
+@functools.lru_cache(maxsize=16)
+def _file_name(path):
+    """Get the file name shown for a loaded path, cached since the panels redraw often"""
+    return Path(path).name
+
 # Draw function for the BIM panel
 def draw_elca_ui(self, context):
-    try:
-        layout = self.layout
-        
-        box = layout.box()
-        box.label(text="eLCA Integration", icon='FILE_REFRESH')
-        
-        # Show dependency status
-        if not dependencies_installed:
-            box.label(text="Dependencies not installed", icon='ERROR')
-            box.operator("elca.install_dependencies", icon='PACKAGE')
+    layout = self.layout
+    
+    box = layout.box()
+    box.label(text="eLCA Integration", icon='FILE_REFRESH')
+    
+    # Show dependency status
+    if not dependencies_installed:
+        box.label(text="Dependencies not installed", icon='ERROR')
+        box.operator("elca.install_dependencies", icon='PACKAGE')
+        return
+    
+    # Show file loading status, resolving the scene once for all lookups
+    scene = context.scene
+    scene_get = scene.get
+    html_path = scene_get("elca_html_path", None)
+    xml_path = scene_get("elca_xml_path", None)
+    matched_data = scene_get("elca_matched_data", "false")
+    has_layer_data = scene_get("elca_layer_data", None)
+    
+    # Step 1: HTML Status
+    if html_path:
+        html_file = _file_name(html_path)
+        box.label(text=f"✓ HTML loaded: {html_file}", icon='CHECKMARK')
+    else:
+        box.label(text="1. Load HTML results file", icon='RADIOBUT_OFF')
+    
+    # Step 2: XML Status  
+    if xml_path:
+        xml_file = _file_name(xml_path)
+        if matched_data == "true" and has_layer_data:
+            box.label(text=f"✓ XML loaded: {xml_file}", icon='CHECKMARK')
+            # Try to show layer count
+            try:
+                layer_summary = has_layer_data
+                if isinstance(layer_summary, str):
+                    # Files saved by older versions store the summary as its repr
+                    layer_summary = ast.literal_eval(layer_summary)
+                layer_count = layer_summary.get('total_layers', 0)
+                element_count = layer_summary.get('total_elements', 0)
+                box.label(text=f"  {element_count} elements, {layer_count} layers matched")
+            except:
+                pass
         else:
-            # Show file loading status
-            html_path = context.scene.get("elca_html_path", None)
-            xml_path = context.scene.get("elca_xml_path", None)
-            matched_data = context.scene.get("elca_matched_data", "false")
-            has_layer_data = context.scene.get("elca_layer_data", None)
-            
-            # Step 1: HTML Status
-            if html_path:
-                html_file = Path(html_path).name
-                box.label(text=f"✓ HTML loaded: {html_file}", icon='CHECKMARK')
-            else:
-                box.label(text="1. Load HTML results file", icon='RADIOBUT_OFF')
-            
-            # Step 2: XML Status  
-            if xml_path:
-                xml_file = Path(xml_path).name
-                if matched_data == "true" and has_layer_data:
-                    box.label(text=f"✓ XML loaded: {xml_file}", icon='CHECKMARK')
-                    # Try to show layer count
-                    try:
-                        layer_summary = eval(has_layer_data)
-                        layer_count = layer_summary.get('total_layers', 0)
-                        element_count = layer_summary.get('total_elements', 0)
-                        box.label(text=f"  {element_count} elements, {layer_count} layers matched")
-                    except:
-                        pass
-                else:
-                    box.label(text=f"⚠ XML loaded: {xml_file} (no matching)", icon='ERROR')
-            else:
-                if html_path:
-                    box.label(text="2. Load XML project file", icon='RADIOBUT_OFF')
-                else:
-                    box.label(text="2. Load XML project file", icon='RADIOBUT_OFF')
-            
-            # File loading buttons
-            col = box.column(align=True)
-            
-            # Step 1: Load HTML
-            row = col.row(align=True)
-            if html_path:
-                row.enabled = False
-                row.operator("elca.load_results", text="✓ HTML Loaded", icon='CHECKMARK')
-            else:
-                row.operator("elca.load_results", text="1. Load Results (HTML)", icon='IMPORT')
-            
-            # Step 2: Load XML (only enabled after HTML)
-            row = col.row(align=True)
-            if not html_path:
-                row.enabled = False
-                row.operator("elca.load_project", text="2. Load Project (XML)", icon='IMPORT')
-            elif xml_path and matched_data == "true":
-                row.enabled = False
-                row.operator("elca.load_project", text="✓ XML Loaded & Matched", icon='CHECKMARK')
-            else:
-                row.operator("elca.load_project", text="2. Load Project (XML)", icon='IMPORT')
-            
-            # Step 3: Create IFC Library (only enabled after both files loaded)
-            if html_path and xml_path and matched_data == "true":
-                col.separator()
-                col.label(text="3. Create IFC Library:")
-                
-                ifc_row = col.row(align=True)
-                create_op = ifc_row.operator("elca.create_ifc_library", text="Create IFC Library", icon='PACKAGE')
-                
-                # Add checkbox for attaching to project
-                attach_row = col.row(align=True)
-                attach_row.prop(context.scene, "elca_attach_to_project", text="Attach to active project")
-            
-            # Reset button
-            if html_path or xml_path:
-                col.separator()
-                col.operator("elca.reset_data", text="Reset All Data", icon='X')
+            box.label(text=f"⚠ XML loaded: {xml_file} (no matching)", icon='ERROR')
+    else:
+        if html_path:
+            box.label(text="2. Load XML project file", icon='RADIOBUT_OFF')
+        else:
+            box.label(text="2. Load XML project file", icon='RADIOBUT_OFF')
+    
+    # File loading buttons
+    col = box.column(align=True)
+    
+    # Step 1: Load HTML
+    row = col.row(align=True)
+    if html_path:
+        row.enabled = False
+        row.operator("elca.load_results", text="✓ HTML Loaded", icon='CHECKMARK')
+    else:
+        row.operator("elca.load_results", text="1. Load Results (HTML)", icon='IMPORT')
+    
+    # Step 2: Load XML (only enabled after HTML)
+    row = col.row(align=True)
+    if not html_path:
+        row.enabled = False
+        row.operator("elca.load_project", text="2. Load Project (XML)", icon='IMPORT')
+    elif xml_path and matched_data == "true":
+        row.enabled = False
+        row.operator("elca.load_project", text="✓ XML Loaded & Matched", icon='CHECKMARK')
+    else:
+        row.operator("elca.load_project", text="2. Load Project (XML)", icon='IMPORT')
+    
+    # Step 3: Create IFC Library (only enabled after both files loaded)
+    if html_path and xml_path and matched_data == "true":
+        col.separator()
+        col.label(text="3. Create IFC Library:")
         
-    except Exception as e:
-        print(f"[eLCA] Error in draw_elca_ui: {e}")
-        print(traceback.format_exc())
+        ifc_row = col.row(align=True)
+        create_op = ifc_row.operator("elca.create_ifc_library", text="Create IFC Library", icon='PACKAGE')
+        
+        # Add checkbox for attaching to project
+        attach_row = col.row(align=True)
+        attach_row.prop(scene, "elca_attach_to_project", text="Attach to active project")
+    
+    # Reset button
+    if html_path or xml_path:
+        col.separator()
+        col.operator("elca.reset_data", text="Reset All Data", icon='X')
+    
+    # Debug output toggle
+    col.separator()
+    col.operator("elca.enable_debug", text="Toggle Debug Output", icon='CONSOLE')
 
 # Function to monkey patch a panel's draw method
 def monkey_patch_panel(panel_class, panel_name):
     if panel_name not in _original_draw_functions:
-        print(f"[eLCA] Storing original draw function for {panel_name}")
+        log.debug("Storing original draw function for %s", panel_name)
         _original_draw_functions[panel_name] = panel_class.draw
     
-    def new_draw(self, context):
+    # Capture the functions once so each redraw skips the registry lookups
+    original_draw = _original_draw_functions[panel_name]
+    
+    def new_draw(self, context, _draw_elca=draw_elca_ui, _draw_original=original_draw):
         try:
             # Draw our UI first
-            draw_elca_ui(self, context)
-            # Then call the original draw function
-            if panel_name in _original_draw_functions:
-                _original_draw_functions[panel_name](self, context)
+            _draw_elca(self, context)
         except Exception as e:
-            print(f"[eLCA] Error in monkey-patched draw function for {panel_name}: {e}")
-            print(traceback.format_exc())
-            # Fallback to original draw if our addition fails
-            if panel_name in _original_draw_functions:
-                _original_draw_functions[panel_name](self, context)
+            log.error("Error in monkey-patched draw function for %s: %s\n%s",
+                      panel_name, e, traceback.format_exc())
+        # Then call the original draw function, even if our addition failed
+        _draw_original(self, context)
     
-    print(f"[eLCA] Setting new draw function for {panel_name}")
+    log.debug("Setting new draw function for %s", panel_name)
     panel_class.draw = new_draw
 
-# Persistent handler to add our UI elements after file load
-@persistent
-def load_handler(dummy):
-    print("\n[eLCA] Load handler triggered")
+# Classes registered by this addon, in registration order
+classes = (
+    ELCA_OT_LoadResults,
+    ELCA_OT_LoadProject,
+    ELCA_OT_CreateIFCLibrary,
+    ELCA_OT_ResetData,
+    ELCA_OT_InstallDependencies,
+    ELCA_OT_EnableDebug,
+    ELCA_OT_ShowMaterialSets,
+    ELCA_OT_RemoveMaterialSets,
+    ELCA_OT_ValidateMaterialSets,
+    ELCA_OT_SyncMaterialSets,
+    ELCA_PT_Panel,
+)
+
+def _patch_panels(force=False):
+    """Add our UI elements to the first target panel found
     
-    # List all panel classes for debugging
-    print("[eLCA] Available Panel classes:")
-    # for i, cls in enumerate(bpy.types.Panel.__subclasses__()):
-    #     if hasattr(cls, '__module__'):
-    #         print(f"  {i+1}. {cls.__module__}.{cls.__name__}")
+    Args:
+        force: Scan the panels even if they were patched before
+    """
+    global _PANEL_BY_FQN
     
-    # Target panel classes to try
-    target_panel_classes = [
-        "bonsai.bim.module.material.ui.BIM_PT_materials",
-        "bonsai.bim.module.material.ui.BIM_PT_object_material",
-    ]
+    # Panel classes survive file loads, so once patched there is nothing left to do
+    # unless register() explicitly asks for a fresh install
+    if _original_draw_functions and not force:
+        log.debug("eLCA UI already installed, skipping panel scan")
+        return
+    
+    # Panels may have been (re)registered since the last scan, rescan once per load
+    _PANEL_BY_FQN = None
     
     found_panel = False
     
-    for target_panel_name in target_panel_classes:
+    # Index all registered panels by their fully qualified name once, instead of
+    # rescanning every Panel subclass for each target
+    panel_index = _panels()
+    
+    for target_panel_name in _TARGET_PANELS:
         try:
-            panel_class = None
-            for cls in bpy.types.Panel.__subclasses__():
-                if hasattr(cls, '__module__') and f"{cls.__module__}.{cls.__name__}" == target_panel_name:
-                    panel_class = cls
-                    break
+            panel_class = panel_index.get(target_panel_name)
             
             if panel_class:
-                print(f"[eLCA] Found panel: {target_panel_name}")
+                log.debug("Found panel: %s", target_panel_name)
                 monkey_patch_panel(panel_class, target_panel_name)
-                print(f"[eLCA] Added eLCA UI to {target_panel_name} panel")
+                log.debug("Added eLCA UI to %s panel", target_panel_name)
                 found_panel = True
                 break  # Stop after finding one panel
             else:
-                print(f"[eLCA] Panel not found: {target_panel_name}")
+                log.debug("Panel not found: %s", target_panel_name)
         
         except Exception as e:
-            print(f"[eLCA] Error processing panel {target_panel_name}: {e}")
-            print(traceback.format_exc())
+            log.error("Error processing panel %s: %s\n%s", target_panel_name, e, traceback.format_exc())
     
     if not found_panel:
-        print("[eLCA] Could not find any target panels. Using fallback panel.")
+        log.warning("Could not find any target panels. Using fallback panel.")
+
+# Persistent handler to add our UI elements after file load
+@persistent
+def load_handler(dummy):
+    log.debug("Load handler triggered")
+    _patch_panels()
 
 def register():
-    print("\n[eLCA] Registering eLCA Bonsai integration...")
-    
-    try:
-        bpy.utils.register_class(ELCA_OT_LoadResults)
-        print("[eLCA] Registered ELCA_OT_LoadResults")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_OT_LoadResults: {e}")
-    
-    try:
-        bpy.utils.register_class(ELCA_OT_LoadProject)
-        print("[eLCA] Registered ELCA_OT_LoadProject")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_OT_LoadProject: {e}")
-    
-    try:
-        bpy.utils.register_class(ELCA_OT_CreateIFCLibrary)
-        print("[eLCA] Registered ELCA_OT_CreateIFCLibrary")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_OT_CreateIFCLibrary: {e}")
-    
-    try:
-        bpy.utils.register_class(ELCA_OT_ResetData)
-        print("[eLCA] Registered ELCA_OT_ResetData")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_OT_ResetData: {e}")
-    
-    try:
-        bpy.utils.register_class(ELCA_OT_InstallDependencies)
-        print("[eLCA] Registered ELCA_OT_InstallDependencies")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_OT_InstallDependencies: {e}")
+    log.debug("Registering eLCA Bonsai integration...")
     
-    try:
-        bpy.utils.register_class(ELCA_PT_Panel)
-        print("[eLCA] Registered ELCA_PT_Panel (fallback panel)")
-    except Exception as e:
-        print(f"[eLCA] Error registering ELCA_PT_Panel: {e}")
+    # Register each class on its own, so one failure does not leave the rest unregistered
+    for cls in classes:
+        try:
+            bpy.utils.register_class(cls)
+            log.debug("Registered %s", cls.__name__)
+        except Exception as e:
+            log.error("Error registering %s: %s", cls.__name__, e)
     
     # Add scene properties for UI state
     try:
@@ -760,87 +811,55 @@ def register():
             description="Attach the created IFC library to the current project",
             default=False
         )
-        print("[eLCA] Added scene properties")
+        log.debug("Added scene properties")
     except Exception as e:
-        print(f"[eLCA] Error adding scene properties: {e}")
+        log.error("Error adding scene properties: %s", e)
     
     # Add our load handler
     if load_handler not in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(load_handler)
-        print("[eLCA] Added load_handler to load_post")
+        log.debug("Added load_handler to load_post")
     
-    # Run the load handler immediately
-    load_handler(None)
+    # Patch the panels immediately, even if they were patched before
+    _patch_panels(force=True)
     
-    print("[eLCA] Registration complete")
+    log.debug("Registration complete")
 
 def unregister():
-    print("\n[eLCA] Unregistering eLCA Bonsai integration...")
+    log.debug("Unregistering eLCA Bonsai integration...")
     
     # Restore original draw functions
+    panel_index = _panels()
     for panel_name, original_draw in _original_draw_functions.items():
         try:
-            panel_class = None
-            for cls in bpy.types.Panel.__subclasses__():
-                if hasattr(cls, '__module__') and f"{cls.__module__}.{cls.__name__}" == panel_name:
-                    panel_class = cls
-                    break
+            panel_class = panel_index.get(panel_name)
             
             if panel_class:
                 panel_class.draw = original_draw
-                print(f"[eLCA] Restored original draw function for {panel_name}")
+                log.debug("Restored original draw function for %s", panel_name)
         except Exception as e:
-            print(f"[eLCA] Error restoring draw function for {panel_name}: {e}")
+            log.error("Error restoring draw function for %s: %s", panel_name, e)
     
     # Remove load handler
     if load_handler in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(load_handler)
-        print("[eLCA] Removed load_handler from load_post")
+        log.debug("Removed load_handler from load_post")
     
     # Remove scene properties
     try:
         del bpy.types.Scene.elca_attach_to_project
-        print("[eLCA] Removed scene properties")
-    except Exception as e:
-        print(f"[eLCA] Error removing scene properties: {e}")
-    
-    try:
-        bpy.utils.unregister_class(ELCA_PT_Panel)
-        print("[eLCA] Unregistered ELCA_PT_Panel")
-    except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_PT_Panel: {e}")
-    
-    try:
-        bpy.utils.unregister_class(ELCA_OT_InstallDependencies)
-        print("[eLCA] Unregistered ELCA_OT_InstallDependencies")
+        log.debug("Removed scene properties")
     except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_OT_InstallDependencies: {e}")
+        log.error("Error removing scene properties: %s", e)
     
-    try:
-        bpy.utils.unregister_class(ELCA_OT_ResetData)
-        print("[eLCA] Unregistered ELCA_OT_ResetData")
-    except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_OT_ResetData: {e}")
-    
-    try:
-        bpy.utils.unregister_class(ELCA_OT_CreateIFCLibrary)
-        print("[eLCA] Unregistered ELCA_OT_CreateIFCLibrary")
-    except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_OT_CreateIFCLibrary: {e}")
-    
-    try:
-        bpy.utils.unregister_class(ELCA_OT_LoadProject)
-        print("[eLCA] Unregistered ELCA_OT_LoadProject")
-    except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_OT_LoadProject: {e}")
-    
-    try:
-        bpy.utils.unregister_class(ELCA_OT_LoadResults)
-        print("[eLCA] Unregistered ELCA_OT_LoadResults")
-    except Exception as e:
-        print(f"[eLCA] Error unregistering ELCA_OT_LoadResults: {e}")
+    for cls in reversed(classes):
+        try:
+            bpy.utils.unregister_class(cls)
+            log.debug("Unregistered %s", cls.__name__)
+        except Exception as e:
+            log.error("Error unregistering %s: %s", cls.__name__, e)
     
-    print("[eLCA] Unregistration complete")
+    log.debug("Unregistration complete")
 
 if __name__ == "__main__":
     print("[eLCA] Running as main script")
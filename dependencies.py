@@ -1,12 +1,15 @@
 import bpy
+import functools
 import os
 import sys
 import site
 import tempfile
 import subprocess
 import importlib
+import importlib.util
 import traceback
 
+@functools.lru_cache(maxsize=1)
 def get_site_packages_path():
     """Get the appropriate site-packages path based on the platform"""
     if sys.platform == "win32":
@@ -18,7 +21,15 @@ def get_site_packages_path():
     
     return site_packages_path
 
+# Set once fix_python_path() has run, sys.path only needs to be extended once
+_PATH_FIXED = False
+
 def fix_python_path():
+    global _PATH_FIXED
+    if _PATH_FIXED:
+        return
+    _PATH_FIXED = True
+    
     # Blender's site-packages path (example for Blender 4.4 on macOS)
     blender_site_packages = "/Applications/Blender.app/Contents/Resources/4.4/python/lib/python3.11/site-packages"
 
@@ -33,13 +44,88 @@ def fix_python_path():
         sys.path.append(site_packages_path)
         print(f"[eLCA] Added user site-packages: {site_packages_path}")
 
-def install_and_import(package_name, import_name=None):
+# Successfully imported dependency modules by import name
+_MODULE_CACHE = {}
+
+def _import_cached(import_name):
+    """
+    Import a module, reusing modules that were imported before
+    
+    Args:
+        import_name: Name of the module to import
+    
+    Returns:
+        The imported module or None if it is not installed
+    """
+    # Return modules found before without going through the import machinery
+    cached = _MODULE_CACHE.get(import_name)
+    if cached is not None:
+        return cached
+    
+    modules = sys.modules
+    if import_name in modules:
+        module = modules[import_name]
+    else:
+        try:
+            module = importlib.import_module(import_name)
+        except ImportError:
+            return None
+    
+    _MODULE_CACHE[import_name] = module
+    return module
+
+def _is_installed(import_name):
+    """
+    Check whether a module can be imported without importing it
+    
+    Args:
+        import_name: Name of the module
+    
+    Returns:
+        True if the module is already imported or can be found on sys.path
+    """
+    if import_name in _MODULE_CACHE or import_name in sys.modules:
+        return True
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _pip_install(package_names, binary_only=False):
+    """
+    Install packages with a single pip invocation
+    
+    Args:
+        package_names: Names of the packages to install (as used by pip)
+        binary_only: Only accept wheels, skipping source builds
+    """
+    # Skip pip's version check request and never wait for input
+    install_cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check", "--no-input"]
+    if binary_only:
+        install_cmd.append("--only-binary=:all:")
+    # Don't use --user flag on macOS
+    if sys.platform != "darwin":  # Not macOS
+        install_cmd.append("--user")
+    install_cmd.extend(package_names)
+    
+    subprocess.check_call(install_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    
+    # Let the import system see the newly installed packages
+    importlib.invalidate_caches()
+
+def _ensure_pip():
+    """Make sure pip is available in Blender's Python"""
+    subprocess.check_call([sys.executable, "-m", "ensurepip", "--upgrade"], 
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def install_and_import(package_name, import_name=None, ensure_pip=True):
     """
     Install a package if not already installed and import it
     
     Args:
         package_name: Name of the package to install (as used by pip)
         import_name: Name of the module to import (if different from package_name)
+        ensure_pip: Run ensurepip before installing (skip if already done)
     
     Returns:
         The imported module or None if import failed
@@ -47,45 +133,53 @@ def install_and_import(package_name, import_name=None):
     if import_name is None:
         import_name = package_name
     
+    if import_name in _MODULE_CACHE:
+        return _MODULE_CACHE[import_name]
+    
     print(f"[eLCA] Checking for {import_name}...")
     
+    module = _import_cached(import_name)
+    if module is not None:
+        print(f"[eLCA] {import_name} is already installed")
+        return module
+    
+    print(f"[eLCA] {import_name} not found, attempting to install {package_name}...")
+    
     try:
-        # Try to import the module
+        # Ensure pip is available
+        if ensure_pip:
+            _ensure_pip()
+        
+        # Install the package
+        _pip_install([package_name])
+        
+        print(f"[eLCA] Successfully installed {package_name}")
+        
+        # Try to import again
         module = importlib.import_module(import_name)
-        print(f"[eLCA] {import_name} is already installed")
+        _MODULE_CACHE[import_name] = module
+        print(f"[eLCA] Successfully imported {import_name}")
         return module
-    except ImportError:
-        print(f"[eLCA] {import_name} not found, attempting to install {package_name}...")
         
-        try:
-            # Get Python executable
-            python_executable = sys.executable
-            
-            # Ensure pip is available
-            subprocess.check_call([python_executable, "-m", "ensurepip", "--upgrade"], 
-                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            # Install the package - don't use --user flag on macOS
-            install_cmd = [python_executable, "-m", "pip", "install", package_name]
-            if sys.platform != "darwin":  # Not macOS
-                install_cmd.append("--user")
-            
-            subprocess.check_call(install_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            print(f"[eLCA] Successfully installed {package_name}")
-            
-            # Try to import again
-            module = importlib.import_module(import_name)
-            print(f"[eLCA] Successfully imported {import_name}")
-            return module
-            
-        except Exception as e:
-            print(f"[eLCA] Error installing package {package_name} using {import_name} as import name: {str(e)}")
-            print(traceback.format_exc())
-            return None
+    except Exception as e:
+        print(f"[eLCA] Error installing package {package_name} using {import_name} as import name: {str(e)}")
+        print(traceback.format_exc())
+        return None
+
+# Set once all dependencies were found, so later calls skip the import/pip probe
+_dependencies_ok = False
 
 def ensure_dependencies():
-    """Ensure all required dependencies are installed"""
+    """
+    Ensure all required dependencies are installed
+    
+    Only a successful result is remembered, so a failed installation can be
+    retried (e.g. from the Install Dependencies button).
+    """
+    global _dependencies_ok
+    if _dependencies_ok:
+        return True
+    
     print("[eLCA] Checking and installing dependencies...")
     
     # Fix Python path
@@ -94,16 +188,33 @@ def ensure_dependencies():
     # List of required packages (package_name, import_name)
     required_packages = [
         ("beautifulsoup4", "bs4"),
+        ("lxml", "lxml"),
         ("pandas", "pandas"),
         ("ifcopenshell", "ifcopenshell"),
     ]
     
-    # Install and import each package
+    # Check all packages first, so the missing ones can be installed in one pip run.
+    # Installed packages are only located, not imported, so heavy modules like pandas
+    # are loaded when they are first used rather than at add-on startup.
+    to_install = [(package_name, import_name) for package_name, import_name in required_packages
+                  if not _is_installed(import_name)]
+    
     missing_packages = []
-    for package_name, import_name in required_packages:
-        module = install_and_import(package_name, import_name)
-        if module is None:
-            missing_packages.append(package_name)
+    if to_install:
+        package_names = [package_name for package_name, import_name in to_install]
+        try:
+            _ensure_pip()
+            print(f"[eLCA] Installing {', '.join(package_names)}...")
+            _pip_install(package_names, binary_only=True)
+        except Exception as e:
+            # Packages that are still missing are installed one by one below
+            print(f"[eLCA] Error installing {', '.join(package_names)} together: {str(e)}")
+        
+        # Import each new package, installing it on its own if the batch install failed for it
+        for package_name, import_name in to_install:
+            module = install_and_import(package_name, import_name, ensure_pip=False)
+            if module is None:
+                missing_packages.append(package_name)
     
     # Report results
     if missing_packages:
@@ -111,6 +222,7 @@ def ensure_dependencies():
         return False
     else:
         print("[eLCA] All dependencies are installed")
+        _dependencies_ok = True
         return True
 
 # Run this when the module is imported
@@ -1,12 +1,99 @@
 # eLCA HTML Parser Module
-from bs4 import BeautifulSoup
-import pandas as pd
+from bs4 import BeautifulSoup, FeatureNotFound, NavigableString, SoupStrainer
+import soupsieve as sv
+import csv
+import logging
+import os
+import re
+import sys
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Union
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Tuple, Union
 from pathlib import Path
 
-@dataclass
+# pandas is only imported by the DataFrame methods, extracting BauteilElements does not need it
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Child of the add-on's 'elca' logger, per-element messages are logged at debug level
+log = logging.getLogger("elca.parser")
+
+# XML namespace of eLCA project files
+ELCA_NS = 'https://www.bauteileditor.de'
+
+# Qualified tag names read from eLCA project files
+_TAG_ELEMENT = f'{{{ELCA_NS}}}element'
+_TAG_ELEMENT_INFO = f'{{{ELCA_NS}}}elementInfo'
+_TAG_NAME = f'{{{ELCA_NS}}}name'
+_TAG_DESCRIPTION = f'{{{ELCA_NS}}}description'
+_TAG_COMPONENT = f'{{{ELCA_NS}}}component'
+
+# Only the tree below the category lists is built, the rest of the report
+# (head, navigation, scripts) is never read
+_CATEGORY_STRAINER = SoupStrainer('ul', class_='category')
+
+# CSS selectors with combinators used to walk eLCA HTML reports, compiled once at
+# import time. Plain tag/class lookups use find()/find_all() instead.
+_SEL_CATEGORY_SECTIONS = sv.compile("ul.category > li.section")
+_SEL_ELEMENT_SECTIONS = sv.compile("ul.report-elements > li.section")
+_SEL_COMPONENT_QUANTITY = sv.compile("span.info-quantity span")
+_SEL_PROCESS_ROWS = sv.compile("table.report-assets-details tbody tr:not(.table-headlines)")
+
+# Classes of the info spans in the details cell of a component row
+_COMPONENT_INFO_CLASSES = frozenset(("process-config-name", "info-is-extant", "info-quantity", "info-life-time"))
+
+# Column layout of the detail DataFrame; property columns go between the bauteil
+# and component columns, process columns are only added if any process exists
+_BAUTEIL_COLUMNS = ('Category Code', 'Category Name', 'Subcategory', 'Bauteil Name', 'Bauteil URL')
+_COMPONENT_COLUMNS = ('Component Category', 'Component Number', 'Component Name',
+                      'Component Status', 'Component Quantity', 'Component Lifetime')
+_PROCESS_COLUMNS = ('Lifecycle Phase', 'Ratio', 'Process Name', 'Reference Value', 'UUID')
+# Layer data joined from the XML project file by element and component name, only added if it was loaded
+_LAYER_COLUMNS = ('Layer Thickness', 'Layer Position')
+
+# Columns after the bauteil properties in the summary DataFrame
+_SUMMARY_COUNT_COLUMNS = ('Component Count', 'Process Count')
+
+# A number in German notation followed by an optional unit, e.g. "200,00 mm". The unit
+# must be separated by whitespace, like the split() the library creator falls back to
+_QUANTITY_RE = re.compile(r'^\s*([\d.,]+)(?:\s+(\S+))?\s*$')
+
+def parse_quantity(text: str) -> Tuple[Optional[float], str]:
+    """
+    Split an eLCA quantity like "200,00 mm" into its numeric value and unit.
+    
+    Args:
+        text: Quantity text as shown in the report
+    
+    Returns:
+        Tuple of the value (None if it cannot be parsed) and the unit ("" if missing)
+    """
+    match = _QUANTITY_RE.match(text)
+    if not match:
+        return None, ""
+    unit = match.group(2) or ""
+    try:
+        return float(match.group(1).replace(',', '.')), unit
+    except ValueError:
+        return None, unit
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern an XML attribute value that repeats across elements, keeping None."""
+    return sys.intern(value) if value is not None else None
+
+def _text(tag) -> str:
+    """
+    Return the stripped text of a tag, same as tag.get_text(strip=True).
+    
+    Most cells in eLCA reports hold a single string, which is read directly instead
+    of walking all descendants.
+    """
+    string = tag.string
+    if string is not None and string.__class__ is NavigableString:
+        return string.strip()
+    return tag.get_text(strip=True)
+
+@dataclass(slots=True)
 class BauteilElement:
     """Represents a building element (Bauteil) with its properties."""
     category_code: str  # e.g., "331"
@@ -19,23 +106,40 @@ class BauteilElement:
     
     def __str__(self):
         return f"{self.category_code} {self.category_name} - {self.name}"
+    
+    def __setstate__(self, state):
+        # Elements are pickled into the scene; also accept the __dict__ state of
+        # elements pickled before the class used slots (older .blend files)
+        if isinstance(state, tuple):
+            state = state[1]
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
 
 class ELCAComponentExtractor:
     """Extracts components and their UUIDs from ELCA HTML reports."""
     
-    def __init__(self, html_path: Optional[Union[str, Path]], xml_path: Optional[Union[str, Path]] = None):
+    def __init__(self, html_path: Optional[Union[str, Path]], xml_path: Optional[Union[str, Path]] = None,
+                 parser: Optional[str] = None):
         """
         Initialize the extractor with the path to the HTML file and optional XML file.
         
         Args:
             html_path: Path to the HTML file containing ELCA data (can be None for XML-only parsing)
             xml_path: Optional path to the XML project file containing layer thickness data
+            parser: Optional BeautifulSoup tree builder for the HTML file (e.g. 'lxml' or
+                'html.parser'). By default lxml is used if available.
         """
         self.html_path = Path(html_path) if html_path else None
         self.xml_path = Path(xml_path) if xml_path else None
+        self.parser = parser
         self.soup = None
-        self.xml_root = None
-        self.xml_layer_data = {}  # Store layer thickness data from XML
+        # Layer thickness data from XML, keyed by '<element UUID>_<component UUID>'
+        self.xml_layer_data: Dict[str, Dict[str, Any]] = {}
+        # Component name -> key in xml_layer_data of the last component with that name
+        self.name_index: Dict[str, str] = {}
+        # Element name -> component name -> keys in xml_layer_data, in document order
+        self.element_index: Dict[str, Dict[str, List[str]]] = {}
+        self._bauteil_elements = None  # Extracted elements, built on first use
         
         # Load HTML file if path is provided
         if self.html_path:
@@ -48,7 +152,6 @@ class ELCAComponentExtractor:
         if self.xml_path and self.xml_path.exists():
             print('[eLCA-parser] Loading XML project file...')
             self._load_xml()
-            self._extract_layer_data_from_xml()
         elif self.xml_path:
             print(f'[eLCA-parser] Warning: XML file not found: {self.xml_path}')
         else:
@@ -59,59 +162,92 @@ class ELCAComponentExtractor:
         if not self.html_path.exists():
             raise FileNotFoundError(f"HTML file not found: {self.html_path}")
         
-        with open(self.html_path, 'r', encoding='utf-8') as file:
+        # Read raw bytes and let the parser decode them, instead of building a
+        # decoded copy of the whole report in Python first
+        with open(self.html_path, 'rb') as file:
             html_content = file.read()
         
-        self.soup = BeautifulSoup(html_content, 'html.parser')
+        # Prefer the C-based lxml parser, fall back to Python's built-in one
+        try:
+            self.soup = BeautifulSoup(html_content, self.parser or 'lxml', parse_only=_CATEGORY_STRAINER,
+                                      from_encoding='utf-8')
+        except FeatureNotFound:
+            if self.parser:
+                raise
+            print('[eLCA-parser] lxml not available, falling back to html.parser')
+            self.soup = BeautifulSoup(html_content, 'html.parser', parse_only=_CATEGORY_STRAINER,
+                                      from_encoding='utf-8')
     
     def extract_bauteil_elements(self) -> List[BauteilElement]:
         """
         Extract all building elements (Bauteile) with their properties.
         
+        The HTML tree is only walked once per extractor, later calls (e.g. from
+        to_dataframe and get_bauteil_summary_dataframe) return the same list.
+        
         Returns:
             List of BauteilElement objects
         """
+        if self._bauteil_elements is None:
+            self._bauteil_elements = self._extract_bauteil_elements()
+        return self._bauteil_elements
+    
+    def reload(self) -> None:
+        """Re-read the HTML and XML files, e.g. after they were changed on disk."""
+        self._bauteil_elements = None
+        self.soup = None
+        self.xml_layer_data = {}
+        self.name_index = {}
+        self.element_index = {}
+        
+        if self.html_path:
+            self._load_html()
+        if self.xml_path and self.xml_path.exists():
+            self._load_xml()
+    
+    def _extract_bauteil_elements(self) -> List[BauteilElement]:
+        """Walk the parsed HTML report and build the BauteilElement objects."""
         bauteil_elements = []
         
         # Find all main category sections
-        category_sections = self.soup.select("ul.category > li.section")
+        category_sections = _SEL_CATEGORY_SECTIONS.select(self.soup)
         
         for category_section in category_sections:
             # Extract category header from h1
-            h1_elem = category_section.select_one("h1")
+            h1_elem = category_section.find("h1")
             if not h1_elem:
                 continue
                 
             # Extract category text (may contain both code and name)
-            category_text = h1_elem.get_text(strip=True)
+            category_text = _text(h1_elem)
             
             # Extract subcategory from span if present
-            span_elem = h1_elem.select_one("span")
+            span_elem = h1_elem.find("span")
             subcategory = None
             if span_elem:
-                subcategory = span_elem.get_text(strip=True)
+                subcategory = _text(span_elem)
                 # Remove subcategory from main category text
                 category_text = category_text.replace(subcategory, "").strip()
             
             # Try to split category into code and name
             category_parts = category_text.split(" ", 1)
-            category_code = category_parts[0] if len(category_parts) > 0 else ""
-            category_name = category_parts[1] if len(category_parts) > 1 else category_text
+            category_code = sys.intern(category_parts[0]) if len(category_parts) > 0 else ""
+            category_name = sys.intern(category_parts[1] if len(category_parts) > 1 else category_text)
             
             # Find all building elements in this category
-            element_sections = category_section.select("ul.report-elements > li.section")
+            element_sections = _SEL_ELEMENT_SECTIONS.select(category_section)
             
             for element_section in element_sections:
                 # Extract element name and URL
-                h2_elem = element_section.select_one("h2")
+                h2_elem = element_section.find("h2")
                 if not h2_elem:
                     continue
                 
-                a_elem = h2_elem.select_one("a.page")
+                a_elem = h2_elem.find("a", class_="page")
                 if not a_elem:
                     continue
                 
-                element_name = a_elem.get_text(strip=True)
+                element_name = _text(a_elem)
                 element_url = a_elem.get("href", "")
                 
                 # Create new bauteil element
@@ -124,75 +260,105 @@ class ELCAComponentExtractor:
                 )
                 
                 # Extract properties from definition list
-                dl_elem = element_section.select_one("dl.clearfix")
+                dl_elem = element_section.find("dl", class_="clearfix")
                 if dl_elem:
-                    dt_elems = dl_elem.select("dt")
-                    for dt in dt_elems:
-                        property_name = dt.get_text(strip=True).rstrip(":")
-                        dd = dt.find_next("dd")
+                    property_pairs = []
+                    for dt in dl_elem.find_all("dt"):
+                        dd = dt.find_next_sibling("dd")
                         if dd:
-                            property_value = dd.get_text(strip=True)
-                            bauteil.properties[property_name] = property_value
+                            # Property names, component categories and lifecycle phases repeat
+                            # across all elements, intern them to keep a single copy of each
+                            property_name = sys.intern(_text(dt).rstrip(":"))
+                            property_pairs.append((property_name, _text(dd)))
+                    bauteil.properties = dict(property_pairs)
                 
                 # Extract components
-                component_sections = element_section.select("div.element-assets")
+                component_sections = element_section.find_all("div", class_="element-assets")
                 for component_section in component_sections:
                     # Get component category
-                    component_category_elem = component_section.select_one("h3")
-                    component_category = component_category_elem.get_text(strip=True) if component_category_elem else "Unknown"
+                    component_category_elem = component_section.find("h3")
+                    component_category = sys.intern(_text(component_category_elem)) if component_category_elem else "Unknown"
                     
                     # Find all component rows
-                    component_rows = component_section.select("tr.component")
+                    component_rows = component_section.find_all("tr", class_="component")
                     
                     for component_row in component_rows:
                         component_data = {
                             "component_category": component_category
                         }
                         
+                        # Find the number and details cells in one pass over the row's cells
+                        number_cell = details_cell = None
+                        for cell in component_row.find_all("td"):
+                            cell_classes = cell.get("class") or ()
+                            if number_cell is None and "firstColumn" in cell_classes:
+                                number_cell = cell
+                            if details_cell is None and "lastColumn" in cell_classes:
+                                details_cell = cell
+                        
                         # Extract component number
-                        number_cell = component_row.select_one("td.firstColumn")
                         if number_cell:
-                            component_data["number"] = number_cell.get_text(strip=True)
+                            component_data["number"] = _text(number_cell)
                         
                         # Extract component details
-                        details_cell = component_row.select_one("td.lastColumn")
                         if details_cell:
+                            # Collect the first info span of each known class in one pass
+                            info_spans = {}
+                            for span in details_cell.find_all("span"):
+                                for class_name in span.get("class") or ():
+                                    if class_name in _COMPONENT_INFO_CLASSES and class_name not in info_spans:
+                                        info_spans[class_name] = span
+                            
                             # Extract component name
-                            name_elem = details_cell.select_one("span.process-config-name")
+                            name_elem = info_spans.get("process-config-name")
                             if name_elem:
-                                component_data["name"] = name_elem.get_text(strip=True)
+                                component_data["name"] = _text(name_elem)
                             
                             # Extract additional component info
-                            status_elem = details_cell.select_one("span.info-is-extant")
+                            status_elem = info_spans.get("info-is-extant")
                             if status_elem:
-                                component_data["status"] = status_elem.get_text(strip=True)
-                                
-                            quantity_elem = details_cell.select_one("span.info-quantity span")
+                                component_data["status"] = _text(status_elem)
+                            
+                            # The quantity is the span nested in the info-quantity span
+                            quantity_elem = info_spans.get("info-quantity")
+                            if quantity_elem:
+                                quantity_elem = quantity_elem.find("span")
+                            if quantity_elem is None and "info-quantity" in info_spans:
+                                # The first info-quantity span holds no value, search all of them
+                                quantity_elem = _SEL_COMPONENT_QUANTITY.select_one(details_cell)
                             if quantity_elem:
-                                component_data["quantity"] = quantity_elem.get_text(strip=True)
-                                
-                            lifetime_elem = details_cell.select_one("span.info-life-time")
+                                quantity = _text(quantity_elem)
+                                component_data["quantity"] = quantity
+                                # Split value and unit once here instead of in every consumer
+                                quantity_value, quantity_unit = parse_quantity(quantity)
+                                if quantity_value is not None:
+                                    component_data["quantity_value"] = quantity_value
+                                    component_data["quantity_unit"] = quantity_unit
+                            
+                            lifetime_elem = info_spans.get("info-life-time")
                             if lifetime_elem:
-                                component_data["lifetime"] = lifetime_elem.get_text(strip=True)
+                                component_data["lifetime"] = _text(lifetime_elem)
                         
-                        # Find the details row that follows this component row
-                        details_row = component_row.find_next("tr", class_="details")
+                        # The details row, if any, is the row directly following this component row
+                        details_row = component_row.find_next_sibling("tr")
+                        if details_row is not None and "details" not in (details_row.get("class") or ()):
+                            details_row = None
                         if details_row:
-                            # Extract lifecycle processes
-                            process_rows = details_row.select("table.report-assets-details tbody tr:not(.table-headlines)")
+                            # Extract lifecycle processes, only the first five cells of a row are read
+                            process_cells = [process_row.find_all("td", limit=5)
+                                             for process_row in _SEL_PROCESS_ROWS.select(details_row)]
                             
-                            lifecycle_processes = []
-                            for process_row in process_rows:
-                                cells = process_row.select("td")
-                                if len(cells) >= 5:
-                                    process_data = {
-                                        "lifecycle_phase": cells[0].get_text(strip=True),
-                                        "ratio": cells[1].get_text(strip=True),
-                                        "process_name": cells[2].get_text(strip=True),
-                                        "reference_value": cells[3].get_text(strip=True),
-                                        "uuid": cells[4].get_text(strip=True)
-                                    }
-                                    lifecycle_processes.append(process_data)
+                            lifecycle_processes = [
+                                {
+                                    "lifecycle_phase": sys.intern(_text(cells[0])),
+                                    "ratio": _text(cells[1]),
+                                    # The same processes are used by many components
+                                    "process_name": sys.intern(_text(cells[2])),
+                                    "reference_value": _text(cells[3]),
+                                    "uuid": sys.intern(_text(cells[4]))
+                                }
+                                for cells in process_cells if len(cells) == 5
+                            ]
                             
                             if lifecycle_processes:
                                 component_data["lifecycle_processes"] = lifecycle_processes
@@ -203,91 +369,171 @@ class ELCAComponentExtractor:
         
         return bauteil_elements
     
-    def to_dataframe(self) -> pd.DataFrame:
+    def to_dataframe(self) -> 'pd.DataFrame':
         """
         Convert extracted bauteil elements to a pandas DataFrame.
         
+        If an XML project file was loaded, the 'Layer Thickness' and 'Layer Position'
+        of the matching XML component are added after the component columns. The report
+        has no element or component UUIDs, so a bauteil is matched to the XML element
+        with the same name, and the n-th component with a name in it to the n-th XML
+        component with that name. Bauteile without an XML element of the same name are
+        matched by the component name alone.
+        
         Returns:
             DataFrame containing the bauteil elements and their components
         """
+        import pandas as pd
+        
         bauteil_elements = self.extract_bauteil_elements()
+        layer_columns = _LAYER_COLUMNS if self.name_index else ()
+        
+        # Collect all columns up front, in the order in which they first appear in the rows,
+        # formatting each property column name only once
+        columns = {}
+        property_columns = {}
+        for bauteil in bauteil_elements:
+            if not bauteil.components:
+                continue
+            columns.update(dict.fromkeys(_BAUTEIL_COLUMNS))
+            for prop_name in bauteil.properties:
+                if prop_name not in property_columns:
+                    property_columns[prop_name] = f'Property: {prop_name}'
+                columns[property_columns[prop_name]] = None
+            columns.update(dict.fromkeys(_COMPONENT_COLUMNS))
+            columns.update(dict.fromkeys(layer_columns))
+            if any(component.get('lifecycle_processes') for component in bauteil.components):
+                columns.update(dict.fromkeys(_PROCESS_COLUMNS))
         
-        # Create a list of dictionaries for DataFrame creation
-        data = []
+        column_index = {name: i for i, name in enumerate(columns)}
+        property_slots = {prop_name: column_index[column] for prop_name, column in property_columns.items()}
+        component_slots = [column_index[name] for name in _COMPONENT_COLUMNS] if columns else []
+        process_slots = [column_index[name] for name in _PROCESS_COLUMNS if name in column_index]
+        layer_slots = [column_index[name] for name in layer_columns if name in column_index]
+        name_index = self.name_index
+        element_index = self.element_index
+        xml_layer_data = self.xml_layer_data
+        # Number of components matched so far per (bauteil name, component name)
+        occurrences = {}
+        missing = float('nan')
+        
+        # Build the rows as flat lists with a fixed layout, values not set stay missing
+        rows = []
         for bauteil in bauteil_elements:
+            if not bauteil.components:
+                continue
+            
+            # Bauteil information and properties are shared by all rows of this bauteil
+            bauteil_row = [missing] * len(column_index)
+            bauteil_row[0:5] = (bauteil.category_code, bauteil.category_name, bauteil.subcategory,
+                                bauteil.name, bauteil.url)
+            for prop_name, prop_value in bauteil.properties.items():
+                bauteil_row[property_slots[prop_name]] = prop_value
+            element_layers = element_index.get(bauteil.name)
+            
             for component in bauteil.components:
-                # Create base row with bauteil information
-                row = {
-                    'Category Code': bauteil.category_code,
-                    'Category Name': bauteil.category_name,
-                    'Subcategory': bauteil.subcategory,
-                    'Bauteil Name': bauteil.name,
-                    'Bauteil URL': bauteil.url
-                }
-                
-                # Add bauteil properties
-                for prop_name, prop_value in bauteil.properties.items():
-                    row[f'Property: {prop_name}'] = prop_value
+                component_row = bauteil_row[:]
+                for slot, value in zip(component_slots, (
+                        component.get('component_category', ''),
+                        component.get('number', ''),
+                        component.get('name', ''),
+                        component.get('status', ''),
+                        component.get('quantity', ''),
+                        component.get('lifetime', ''))):
+                    component_row[slot] = value
                 
-                # Add component information
-                row['Component Category'] = component.get('component_category', '')
-                row['Component Number'] = component.get('number', '')
-                row['Component Name'] = component.get('name', '')
-                row['Component Status'] = component.get('status', '')
-                row['Component Quantity'] = component.get('quantity', '')
-                row['Component Lifetime'] = component.get('lifetime', '')
+                # Join the XML layer data by element and component name with dict lookups
+                if layer_slots:
+                    component_name = component.get('name')
+                    if element_layers is not None:
+                        occurrence_key = (bauteil.name, component_name)
+                        occurrence = occurrences.get(occurrence_key, 0)
+                        occurrences[occurrence_key] = occurrence + 1
+                        layer_keys = element_layers.get(component_name, ())
+                        layer_key = layer_keys[occurrence] if occurrence < len(layer_keys) else None
+                    else:
+                        layer_key = name_index.get(component_name)
+                    if layer_key is not None:
+                        layer = xml_layer_data[layer_key]
+                        component_row[layer_slots[0]] = layer['layer_thickness']
+                        component_row[layer_slots[1]] = layer['layer_position']
                 
                 # Add lifecycle processes if available
                 lifecycle_processes = component.get('lifecycle_processes', [])
                 if lifecycle_processes:
                     for process in lifecycle_processes:
-                        process_row = row.copy()
-                        process_row['Lifecycle Phase'] = process.get('lifecycle_phase', '')
-                        process_row['Ratio'] = process.get('ratio', '')
-                        process_row['Process Name'] = process.get('process_name', '')
-                        process_row['Reference Value'] = process.get('reference_value', '')
-                        process_row['UUID'] = process.get('uuid', '')
-                        data.append(process_row)
+                        process_row = component_row[:]
+                        for slot, value in zip(process_slots, (
+                                process.get('lifecycle_phase', ''),
+                                process.get('ratio', ''),
+                                process.get('process_name', ''),
+                                process.get('reference_value', ''),
+                                process.get('uuid', ''))):
+                            process_row[slot] = value
+                        rows.append(process_row)
                 else:
                     # Add row even if no lifecycle processes
-                    data.append(row)
+                    rows.append(component_row)
         
-        return pd.DataFrame(data)
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, columns=list(columns))
     
-    def get_bauteil_summary_dataframe(self) -> pd.DataFrame:
+    def _bauteil_summary_rows(self, missing: Any) -> Tuple[List[str], List[list]]:
         """
-        Get a simplified DataFrame with just the bauteil IDs and basic info.
+        Build the columns and rows of the bauteil summary, one row per bauteil.
+        
+        Args:
+            missing: Value used for properties that are not set on a bauteil
         
         Returns:
-            DataFrame containing basic bauteil information
+            Tuple of the column names and the rows as lists in column order
         """
         bauteil_elements = self.extract_bauteil_elements()
         
-        # Create a list of dictionaries for DataFrame creation
-        data = []
+        # Collect all columns up front, in the order in which they first appear in the rows
+        columns = {}
+        for bauteil in bauteil_elements:
+            columns.update(dict.fromkeys(_BAUTEIL_COLUMNS))
+            columns.update(dict.fromkeys(bauteil.properties))
+            columns.update(dict.fromkeys(_SUMMARY_COUNT_COLUMNS))
+        
+        column_index = {name: i for i, name in enumerate(columns)}
+        count_slots = [column_index[name] for name in _SUMMARY_COUNT_COLUMNS] if columns else []
+        
+        # Build one flat row per bauteil, properties not set on a bauteil stay missing
+        rows = []
         for bauteil in bauteil_elements:
-            row = {
-                'Category Code': bauteil.category_code,
-                'Category Name': bauteil.category_name,
-                'Subcategory': bauteil.subcategory,
-                'Bauteil Name': bauteil.name,
-                'Bauteil URL': bauteil.url
-            }
+            row = [missing] * len(column_index)
+            row[0:5] = (bauteil.category_code, bauteil.category_name, bauteil.subcategory,
+                        bauteil.name, bauteil.url)
             
             # Add bauteil properties
             for prop_name, prop_value in bauteil.properties.items():
-                row[prop_name] = prop_value
+                row[column_index[prop_name]] = prop_value
             
             # Count components and processes
-            component_count = len(bauteil.components)
-            process_count = sum(len(comp.get('lifecycle_processes', [])) for comp in bauteil.components)
-            
-            row['Component Count'] = component_count
-            row['Process Count'] = process_count
+            components = bauteil.components
+            row[count_slots[0]] = len(components)
+            row[count_slots[1]] = sum(len(comp.get('lifecycle_processes', ())) for comp in components)
             
-            data.append(row)
+            rows.append(row)
         
-        return pd.DataFrame(data)
+        return list(columns), rows
+    
+    def get_bauteil_summary_dataframe(self) -> 'pd.DataFrame':
+        """
+        Get a simplified DataFrame with just the bauteil IDs and basic info.
+        
+        Returns:
+            DataFrame containing basic bauteil information
+        """
+        import pandas as pd
+        
+        columns, rows = self._bauteil_summary_rows(float('nan'))
+        if not rows:
+            return pd.DataFrame()
+        return pd.DataFrame(rows, columns=columns)
     
     def save_to_csv(self, output_path: Union[str, Path]) -> None:
         """
@@ -307,148 +553,179 @@ class ELCAComponentExtractor:
         Args:
             output_path: Path where the CSV file will be saved
         """
-        df = self.get_bauteil_summary_dataframe()
-        df.to_csv(output_path, index=False, encoding='utf-8')
+        # The summary has one row per bauteil and is written directly with the csv
+        # module, building a DataFrame just to serialize it is not needed
+        columns, rows = self._bauteil_summary_rows(None)
+        with open(output_path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, lineterminator=os.linesep)
+            if rows:
+                writer.writerow(columns)
+                writer.writerows(rows)
+            else:
+                # Same output as an empty DataFrame
+                file.write(os.linesep)
         print(f"Bauteil summary saved to {output_path}")
     
     def _load_xml(self) -> None:
-        """Load and parse the XML project file."""
+        """
+        Stream-parse the XML project file and extract its layer thickness data.
+        
+        Elements are processed as soon as their closing tag has been parsed and are
+        cleared afterwards, so the whole document tree is never held in memory.
+        """
         if not self.xml_path or not self.xml_path.exists():
             raise FileNotFoundError(f"XML file not found: {self.xml_path}")
         
+        element_tag = _TAG_ELEMENT
+        elements_found = 0
+        depth = 0
+        
         try:
-            tree = ET.parse(self.xml_path)
-            self.xml_root = tree.getroot()
+            for event, elem in ET.iterparse(self.xml_path, events=('start', 'end')):
+                if elem.tag != element_tag:
+                    continue
+                if event == 'start':
+                    depth += 1
+                    continue
+                
+                depth -= 1
+                if depth:
+                    # Nested elements are processed together with their outermost element
+                    continue
+                
+                # Process this element and any nested ones in document order
+                for element in elem.iter(element_tag):
+                    self._extract_layer_data_from_element(element)
+                    elements_found += 1
+                elem.clear()
+            
             print(f'[eLCA-parser] Successfully loaded XML project file: {self.xml_path}')
             
         except ET.ParseError as e:
             print(f'[eLCA-parser] Error parsing XML file: {e}')
-            self.xml_root = None
             raise Exception(f"XML parsing error: {e}")
         
         except Exception as e:
             print(f'[eLCA-parser] Error loading XML file: {e}')
-            self.xml_root = None
             raise Exception(f"Error loading XML file: {e}")
+        
+        if not elements_found:
+            print('[eLCA-parser] No element tags found in XML')
+            return
+        print(f'[eLCA-parser] Found {elements_found} element tags in XML')
+        print(f'[eLCA-parser] Extracted {len(self.xml_layer_data)} entries from XML')
 
-    def _extract_layer_data_from_xml(self) -> None:
-        """Extract layer thickness data from XML file."""
-        # if not self.xml_root:
-        #     return
-        ELCA_NS = 'https://www.bauteileditor.de'
-        print(f'[eLCA-parser] inspecting DOM {self.xml_root}')
+    def _extract_layer_data_from_element(self, element: ET.Element) -> None:
+        """Extract layer thickness data from a single XML element tag."""
         try:
-            # Find all elements in the XML at any depth using iter()
-            el = self.xml_root.iter(f'{{{ELCA_NS}}}element')
-            print(f'[eLCA-parser] Found{list(el)} element tags in XML')
-            elements_found = list(self.xml_root.iter(f'{{{ELCA_NS}}}element'))
-            if not elements_found:
-                print('[eLCA-parser] No element tags found in XML')
-                return
-            print(f'[eLCA-parser] Found {len(elements_found)} element tags in XML')
+            element_uuid = element.get('uuid')
+            din276_code = _intern(element.get('din276Code'))
+            quantity = element.get('quantity')
+            ref_unit = _intern(element.get('refUnit'))
             
-            for element in elements_found:
-                element_uuid = element.get('uuid')
-                din276_code = element.get('din276Code')
-                quantity = element.get('quantity')
-                ref_unit = element.get('refUnit')
-                
-                if not element_uuid:
-                    continue  # Skip elements without UUID
-                
-                print(f'[eLCA-parser] Processing element UUID: {element_uuid}')
-                
-                # Extract element name from CDATA in elementInfo/name
-                element_name = ""
-                element_info = element.find(f'{{{ELCA_NS}}}elementInfo')
-                if element_info is not None:
-                    name_elem = element_info.find(f'{{{ELCA_NS}}}name')
-                    if name_elem is not None and name_elem.text:
-                        element_name = name_elem.text.strip()
-                        print(f'[eLCA-parser] Found element: {element_name}')
-                
-                # Extract element description from CDATA in elementInfo/description
-                element_description = ""
-                if element_info is not None:
-                    desc_elem = element_info.find(f'{{{ELCA_NS}}}description')
-                    if desc_elem is not None and desc_elem.text:
-                        element_description = desc_elem.text.strip()
+            if not element_uuid:
+                return  # Skip elements without UUID
+            
+            log.debug('Processing element UUID: %s', element_uuid)
+            
+            # Extract element name from CDATA in elementInfo/name
+            element_name = ""
+            element_info = element.find(_TAG_ELEMENT_INFO)
+            if element_info is not None:
+                name_elem = element_info.find(_TAG_NAME)
+                if name_elem is not None and name_elem.text:
+                    element_name = name_elem.text.strip()
+                    log.debug('Found element: %s', element_name)
+            
+            # Extract element description from CDATA in elementInfo/description
+            element_description = ""
+            if element_info is not None:
+                desc_elem = element_info.find(_TAG_DESCRIPTION)
+                if desc_elem is not None and desc_elem.text:
+                    element_description = desc_elem.text.strip()
+            
+            # Find all components within this element at any depth
+            components_found = list(element.iter(_TAG_COMPONENT))
+            log.debug('Found %d components in element %s', len(components_found), element_uuid)
+            
+            for component in components_found:
+                component_uuid = component.get('uuid')
+                is_layer = _intern(component.get('isLayer'))
+                layer_size = component.get('layerSize')
+                layer_position = component.get('layerPosition')
+                layer_ratio = component.get('layerAreaRatio')
                 
-                # Find all components within this element at any depth
-                components_found = list(element.iter(f'{{{ELCA_NS}}}component'))
-                print(f'[eLCA-parser] Found {len(components_found)} components in element {element_uuid}')
+                # Extract additional attributes from the component tag
+                process_config_uuid = component.get('processConfigUuid')
+                process_config_name = component.get('processConfigName')
+                life_time = component.get('lifeTime')
+                life_time_delay = component.get('lifeTimeDelay')
+                calc_lca = _intern(component.get('calcLca'))
+                is_extant = _intern(component.get('isExtant'))
+                layer_length = component.get('layerLength')
+                layer_width = component.get('layerWidth')
+                component_name = process_config_name
+                log.debug('Processing component UUID: %s, isLayer: %s, layerSize: %s, processConfigName: %s',
+                          component_uuid, is_layer, layer_size, process_config_name)
                 
-                for component in components_found:
-                    component_uuid = component.get('uuid')
-                    is_layer = component.get('isLayer')
-                    layer_size = component.get('layerSize')
-                    layer_position = component.get('layerPosition')
-                    layer_ratio = component.get('layerAreaRatio')
+                # Only process components marked as layers with a size
+                try:
+                    thickness = float(layer_size) if layer_size else 0.0
                     
-                    # Extract additional attributes from the component tag
-                    process_config_uuid = component.get('processConfigUuid')
-                    process_config_name = component.get('processConfigName')
-                    life_time = component.get('lifeTime')
-                    life_time_delay = component.get('lifeTimeDelay')
-                    calc_lca = component.get('calcLca')
-                    is_extant = component.get('isExtant')
-                    layer_length = component.get('layerLength')
-                    layer_width = component.get('layerWidth')
-                    component_name = process_config_name
-                    print(f'[eLCA-parser] Processing component UUID: {component_uuid}, isLayer: {is_layer}, layerSize: {layer_size}, processConfigName: {process_config_name}')
+                    # Extract component name from CDATA in componentInfo/name
                     
-                    # Only process components marked as layers with a size
-                    try:
-                        thickness = float(layer_size) if layer_size else 0.0
-                        
-                        # Extract component name from CDATA in componentInfo/name
-                        
-                        # Store layer data
-                        layer_key = f"{element_uuid}_{component_uuid}" if component_uuid else f"{element_uuid}_{component_name}"
-                        
-                        self.xml_layer_data[layer_key] = {
-                            'element_uuid': element_uuid,
-                            'element_name': element_name,
-                            'element_description': element_description,
-                            'element_din276': din276_code,
-                            'element_quantity': quantity,
-                            'element_ref_unit': ref_unit,
-                            'component_name': component_name,
-                            'layer_thickness': thickness, # This is layer_size converted to float
-                            'component_uuid': component_uuid, # This is the component's uuid
-                            'is_layer': is_layer,
-                            # Add newly extracted attributes
-                            'process_config_uuid': process_config_uuid,
-                            'process_config_name': process_config_name,
-                            'life_time': life_time,
-                            'life_time_delay': life_time_delay,
-                            'calc_lca': calc_lca,
-                            'is_extant': is_extant,
-                            'layer_position': layer_position,
-                            'layer_ratio': layer_ratio,
-                            'layer_length': layer_length,
-                            'layer_width': layer_width
-                        }
-                        
-                        # Also store by component name for easier matching (if name exists)
-                        # Note: This might overwrite if component names are not unique across elements
-                        if component_name:
-                            self.xml_layer_data[component_name] = self.xml_layer_data[layer_key]
-                        
-                        print(f'[eLCA-parser] Found layer: {component_name} with thickness {thickness} mm in element: {element_name}')
-                        
-                    except ValueError:
-                        print(f'[eLCA-parser] Invalid layer size value: {layer_size} for component {component_uuid}')
-            
-            print(f'[eLCA-parser] Extracted {len(self.xml_layer_data)} entries from XML')
-            
+                    # Store layer data
+                    layer_key = f"{element_uuid}_{component_uuid}" if component_uuid else f"{element_uuid}_{component_name}"
+                    
+                    self.xml_layer_data[layer_key] = {
+                        'element_uuid': element_uuid,
+                        'element_name': element_name,
+                        'element_description': element_description,
+                        'element_din276': din276_code,
+                        'element_quantity': quantity,
+                        'element_ref_unit': ref_unit,
+                        'component_name': component_name,
+                        'layer_thickness': thickness, # This is layer_size converted to float
+                        'component_uuid': component_uuid, # This is the component's uuid
+                        'is_layer': is_layer,
+                        # Add newly extracted attributes
+                        'process_config_uuid': process_config_uuid,
+                        'process_config_name': process_config_name,
+                        'life_time': life_time,
+                        'life_time_delay': life_time_delay,
+                        'calc_lca': calc_lca,
+                        'is_extant': is_extant,
+                        'layer_position': layer_position,
+                        'layer_ratio': layer_ratio,
+                        'layer_length': layer_length,
+                        'layer_width': layer_width
+                    }
+                    
+                    # Also index by component name for easier matching (if name exists).
+                    # Component names are not unique across elements, the last one wins.
+                    if component_name:
+                        self.name_index[component_name] = layer_key
+                        if element_name:
+                            self.element_index.setdefault(element_name, {}).setdefault(component_name, []).append(layer_key)
+                    
+                    log.debug('Found layer: %s with thickness %s mm in element: %s',
+                              component_name, thickness, element_name)
+                    
+                except ValueError:
+                    log.warning('Invalid layer size value: %s for component %s', layer_size, component_uuid)
+        
         except Exception as e:
             print(f'[eLCA-parser] Error extracting layer data from XML: {e}')
             import traceback
             traceback.print_exc()
 
     def get_layer_thickness_summary(self) -> Dict[str, Any]:
-        """Get a summary of layer thickness data from XML."""
+        """
+        Get a summary of layer thickness data from XML.
+        
+        Every XML component is counted once. Name lookups go through name_index and
+        are not stored in xml_layer_data, so they are not counted as entries.
+        """
         if not self.xml_layer_data:
             return {'total_elements': 0, 'total_layers': 0, 'total_components': 0}
         
@@ -457,14 +734,14 @@ class ELCAComponentExtractor:
         layer_count = 0
         component_count = 0
         
-        for key, data in self.xml_layer_data.items():
-            if isinstance(data, dict):
-                if data.get('element_uuid'):
-                    unique_elements.add(data['element_uuid'])
-                if data.get('is_layer', False):
-                    layer_count += 1
-                else:
-                    component_count += 1
+        # Every component is stored once, name lookups go through name_index
+        for data in self.xml_layer_data.values():
+            if data.get('element_uuid'):
+                unique_elements.add(data['element_uuid'])
+            if data.get('is_layer', False):
+                layer_count += 1
+            else:
+                component_count += 1
         
         return {
             'total_elements': len(unique_elements),
@@ -1,5 +1,6 @@
 # IFC Library Creator Module
 import ifcopenshell
+import os
 import uuid
 import datetime
 from typing import List, Dict, Any, Union
@@ -9,6 +10,88 @@ def create_guid():
     """Create a compressed IFC GUID"""
     return ifcopenshell.guid.compress(uuid.uuid4().hex)
 
+def create_guid_batch(count):
+    """
+    Create a list of compressed IFC GUIDs from a single random read.
+    
+    Args:
+        count: Number of GUIDs to create
+    
+    Returns:
+        List of compressed IFC GUIDs (random version 4 UUIDs)
+    """
+    raw = os.urandom(16 * count)
+    return [ifcopenshell.guid.compress(uuid.UUID(bytes=raw[i:i + 16], version=4).hex)
+            for i in range(0, 16 * count, 16)]
+
+def iter_guids(batch_size=64):
+    """
+    Yield compressed IFC GUIDs without end, generating them in batches.
+    
+    For callers that do not know up front how many GUIDs they need.
+    
+    Args:
+        batch_size: Number of GUIDs created per random read
+    """
+    while True:
+        yield from create_guid_batch(batch_size)
+
+# Number of length units per meter, used to convert eLCA layer thicknesses
+_UNITS_PER_METER = {'mm': 1000.0, 'cm': 100.0, 'm': 1.0}
+
+def length_to_meters(value, unit):
+    """
+    Convert a length to meters.
+    
+    Args:
+        value: Numeric length
+        unit: Unit of the length ("mm", "cm" or "m"), unknown or missing units are taken as mm
+    
+    Returns:
+        The length in meters
+    """
+    # Default to mm, also if the unit is unknown
+    return value / _UNITS_PER_METER.get(unit.lower() if unit else 'mm', 1000.0)
+
+def parse_thickness(quantity_text):
+    """
+    Parse a layer thickness in meters from an eLCA quantity string.
+    
+    Args:
+        quantity_text: Quantity as shown in the eLCA report, e.g. "200,00 mm"
+    
+    Returns:
+        The thickness in meters, 0.0 if the text is empty or 0.01 if it cannot be parsed
+    """
+    if not quantity_text:
+        return 0.0
+    
+    # Split once and reuse the parts for both the value and the unit
+    parts = quantity_text.split()
+    try:
+        thickness_value = float(parts[0].replace(',', '.'))
+    except (ValueError, IndexError):
+        return 0.01  # Default thickness if parsing fails
+    return length_to_meters(thickness_value, parts[1] if len(parts) > 1 else 'mm')
+
+def component_thickness(component):
+    """
+    Get the layer thickness of a component in meters.
+    
+    Uses the value and unit split off by the parser if present and falls back to
+    parsing the quantity text.
+    
+    Args:
+        component: Component dictionary of a BauteilElement
+    
+    Returns:
+        The thickness in meters
+    """
+    quantity_value = component.get('quantity_value')
+    if quantity_value is not None:
+        return length_to_meters(quantity_value, component.get('quantity_unit'))
+    return parse_thickness(component.get('quantity', ''))
+
 def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
     """
     Create an IFC library file from extracted BauteilElement objects.
@@ -22,6 +105,12 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
     """
     # Create a new IFC file
     ifc_file = ifcopenshell.file()
+    now_ts = int(datetime.datetime.now().timestamp())
+    
+    # Pre-generate all GUIDs: one for the project and three (wall type and two
+    # relations) per element that has components
+    n_elements = sum(1 for element in bauteil_elements if element.components)
+    guids = iter(create_guid_batch(1 + 3 * n_elements))
     
     # Create basic IFC entities
     # Create owner history
@@ -42,20 +131,18 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
                                           OwningUser=person_and_org,
                                           OwningApplication=application,
                                           ChangeAction="ADDED",
-                                          CreationDate=int(datetime.datetime.now().timestamp()))
+                                          CreationDate=now_ts)
     
     # Create units
-    unit_assignment = ifc_file.create_entity("IfcUnitAssignment")
-    
     # Length unit (meters)
     length_unit = ifc_file.create_entity("IfcSIUnit", 
                                         UnitType="LENGTHUNIT", 
                                         Name="METRE")
-    unit_assignment.Units = (length_unit,)
+    unit_assignment = ifc_file.create_entity("IfcUnitAssignment", Units=(length_unit,))
     
     # Create project
     project = ifc_file.create_entity("IfcProject", 
-                                    GlobalId=create_guid(),
+                                    GlobalId=next(guids),
                                     Name="eLCA Material Library",
                                     OwnerHistory=owner_history,
                                     UnitsInContext=unit_assignment)
@@ -66,16 +153,16 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
                                     Version="1.0",
                                     Publisher=organization)
     
+    # Materials by name, category and Oekobaudat processes, shared by all layers
+    # that use the same material
+    material_cache = {}
+    
     # Process each bauteil element
     for element in bauteil_elements:
         # Skip if no components
         if not element.components:
             continue
             
-        # Create material layer set with proper name
-        layer_set_name = f"{element.category_code} {element.name}"
-        material_layer_set = ifc_file.create_entity("IfcMaterialLayerSet", 
-                                                   LayerSetName=layer_set_name)
         material_layers = []
         
         # Create material layers for each component
@@ -83,35 +170,26 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
             component_name = component.get('name', f'Component_{idx}')
             
             # Try to extract thickness from quantity
-            thickness = 0.0
-            quantity_text = component.get('quantity', '')
-            if quantity_text:
-                # Try to parse thickness from quantity (assuming format like "200,00 mm")
-                try:
-                    # Extract numeric part and convert to float
-                    numeric_part = quantity_text.split()[0].replace(',', '.')
-                    unit_part = quantity_text.split()[1] if len(quantity_text.split()) > 1 else 'mm'
-                    
-                    thickness_value = float(numeric_part)
-                    
-                    # Convert to meters based on unit
-                    if unit_part.lower() == 'mm':
-                        thickness = thickness_value / 1000.0
-                    elif unit_part.lower() == 'cm':
-                        thickness = thickness_value / 100.0
-                    elif unit_part.lower() == 'm':
-                        thickness = thickness_value
-                    else:
-                        # Default to mm if unit is unknown
-                        thickness = thickness_value / 1000.0
-                except (ValueError, IndexError):
-                    thickness = 0.01  # Default thickness if parsing fails
+            thickness = component_thickness(component)
             
-            # Create material
-            material = ifc_file.create_entity("IfcMaterial", Name=component_name)
+            # Reuse the material if another layer already created one with the same name,
+            # category and processes, its Oekobaudat properties are attached already.
+            # Components without a name get the generated fallback name and are never shared.
+            lifecycle_processes = component.get('lifecycle_processes', [])
+            material_key = None
+            if 'name' in component:
+                material_key = (component_name, component.get('component_category'),
+                                tuple((process.get('process_name'), process.get('uuid'))
+                                      for process in lifecycle_processes))
+            material = material_cache.get(material_key) if material_key is not None else None
+            if material is not None:
+                lifecycle_processes = []
+            else:
+                material = ifc_file.create_entity("IfcMaterial", Name=component_name)
+                if material_key is not None:
+                    material_cache[material_key] = material
             
             # Add classification reference for UUID if available
-            lifecycle_processes = component.get('lifecycle_processes', [])
             if lifecycle_processes:
                 for process in lifecycle_processes:
                     process_uuid = process.get('uuid')
@@ -143,15 +221,19 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
             
             material_layers.append(material_layer)
         
-        # Set the material layers
         if material_layers:
-            material_layer_set.MaterialLayers = tuple(material_layers)
+            # Create the material layer set with its layers in a single call instead
+            # of creating it empty and assigning the aggregate afterwards
+            layer_set_name = f"{element.category_code} {element.name}"
+            material_layer_set = ifc_file.create_entity("IfcMaterialLayerSet",
+                                                       MaterialLayers=tuple(material_layers),
+                                                       LayerSetName=layer_set_name)
             
             # Create a wall type for this material layer set
             wall_type_name = f"{element.category_code} {element.name}"
             wall_type = ifc_file.create_entity(
                 "IfcWallType",
-                GlobalId=create_guid(),
+                GlobalId=next(guids),
                 OwnerHistory=owner_history,
                 Name=wall_type_name,
                 Description=f"Wall type for {element.name}",
@@ -166,7 +248,7 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
             # Associate the material layer set with the wall type
             ifc_file.create_entity(
                 "IfcRelAssociatesMaterial",
-                GlobalId=create_guid(),
+                GlobalId=next(guids),
                 OwnerHistory=owner_history,
                 RelatedObjects=[wall_type],
                 RelatingMaterial=material_layer_set
@@ -175,7 +257,7 @@ def create_ifc_library_from_bauteil_elements(bauteil_elements, output_path):
             # Create a relation to the library
             ifc_file.create_entity(
                 "IfcRelAssociatesLibrary",
-                GlobalId=create_guid(),
+                GlobalId=next(guids),
                 OwnerHistory=owner_history,
                 Name=f"Association {element.name}",
                 Description=f"Association to library for {element.name}",
@@ -256,14 +338,26 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
         # Find all wall types in the library file
         wall_types = library_file.by_type("IfcWallType")
         
+        # GUIDs for the new wall types and relations, three per wall type plus
+        # one per copied classification
+        guids = iter_guids(max(3 * len(wall_types), 1))
+        
+        # Index the material and classification associations of the library by the
+        # id of their related objects, so every lookup below is a dict access
+        material_association_by_id = {}
+        for rel in library_file.by_type("IfcRelAssociatesMaterial"):
+            for obj in rel.RelatedObjects:
+                material_association_by_id.setdefault(obj.id(), rel)
+        
+        classification_rels_by_id = {}
+        for rel_classification in library_file.by_type("IfcRelAssociatesClassification"):
+            for obj in rel_classification.RelatedObjects:
+                classification_rels_by_id.setdefault(obj.id(), []).append(rel_classification)
+        
         # Import each wall type and its associated material layer set
         for wall_type in wall_types:
             # Find the material association for this wall type
-            material_association = None
-            for rel in library_file.by_type("IfcRelAssociatesMaterial"):
-                if wall_type.id() in [obj.id() for obj in rel.RelatedObjects]:
-                    material_association = rel
-                    break
+            material_association = material_association_by_id.get(wall_type.id())
                     
             if not material_association:
                 print(f"No material association found for wall type: {wall_type.Name}")
@@ -274,12 +368,6 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
                 print(f"Material association is not a layer set for wall type: {wall_type.Name}")
                 continue
                 
-            # Create a new material layer set in the project file
-            new_mls = project_file.create_entity(
-                "IfcMaterialLayerSet",
-                LayerSetName=material_layer_set.LayerSetName
-            )
-            
             # Create new material layers
             new_layers = []
             for layer in material_layer_set.MaterialLayers:
@@ -293,26 +381,25 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
                 )
                 
                 # Add classification references if any
-                for rel_classification in library_file.by_type("IfcRelAssociatesClassification"):
-                    if layer.Material.id() in [obj.id() for obj in rel_classification.RelatedObjects]:
-                        ref = rel_classification.RelatingClassification
-                        
-                        # Create new classification reference
-                        new_ref = project_file.create_entity(
-                            "IfcClassificationReference",
-                            Location=ref.Location,
-                            Identification=ref.Identification,
-                            Name=ref.Name
-                        )
-                        
-                        # Associate with the new material
-                        project_file.create_entity(
-                            "IfcRelAssociatesClassification",
-                            GlobalId=create_guid(),
-                            OwnerHistory=owner_history,
-                            RelatedObjects=[new_material],
-                            RelatingClassification=new_ref
-                        )
+                for rel_classification in classification_rels_by_id.get(layer.Material.id(), ()):
+                    ref = rel_classification.RelatingClassification
+                    
+                    # Create new classification reference
+                    new_ref = project_file.create_entity(
+                        "IfcClassificationReference",
+                        Location=ref.Location,
+                        Identification=ref.Identification,
+                        Name=ref.Name
+                    )
+                    
+                    # Associate with the new material
+                    project_file.create_entity(
+                        "IfcRelAssociatesClassification",
+                        GlobalId=next(guids),
+                        OwnerHistory=owner_history,
+                        RelatedObjects=[new_material],
+                        RelatingClassification=new_ref
+                    )
                 
                 # Create a new material layer
                 new_layer = project_file.create_entity(
@@ -324,14 +411,18 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
                 
                 new_layers.append(new_layer)
             
-            # Set the material layers
             if new_layers:
-                new_mls.MaterialLayers = tuple(new_layers)
+                # Create a new material layer set in the project file with its layers
+                new_mls = project_file.create_entity(
+                    "IfcMaterialLayerSet",
+                    MaterialLayers=tuple(new_layers),
+                    LayerSetName=material_layer_set.LayerSetName
+                )
                 
                 # Create a new wall type in the project file
                 new_wall_type = project_file.create_entity(
                     "IfcWallType",
-                    GlobalId=create_guid(),
+                    GlobalId=next(guids),
                     OwnerHistory=owner_history,
                     Name=wall_type.Name,
                     Description=wall_type.Description,
@@ -346,7 +437,7 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
                 # Associate the material layer set with the wall type
                 project_file.create_entity(
                     "IfcRelAssociatesMaterial",
-                    GlobalId=create_guid(),
+                    GlobalId=next(guids),
                     OwnerHistory=owner_history,
                     RelatedObjects=[new_wall_type],
                     RelatingMaterial=new_mls
@@ -355,7 +446,7 @@ def attach_library_to_project(ifc_project_path, ifc_library_path):
                 # Associate with the library
                 project_file.create_entity(
                     "IfcRelAssociatesLibrary",
-                    GlobalId=create_guid(),
+                    GlobalId=next(guids),
                     OwnerHistory=owner_history,
                     Name=f"Association {new_wall_type.Name}",
                     Description=f"Association to library for {new_wall_type.Name}",
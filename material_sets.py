@@ -11,11 +11,22 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 
+import ast
 import bpy
+import hashlib
 import ifcopenshell
+import json
+import logging
+import os
 import traceback
+from itertools import chain
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
+# Like in the parser, messages telling what was added, copied, created or updated are printed.
+# Per-material details of bulk removals and exports, which print a total, go to the debug log.
+log = logging.getLogger("elca.material_sets")
+
 def get_active_ifc_file():
     """Get the active IFC file from BlenderBIM"""
     try:
@@ -30,6 +41,72 @@ def get_active_ifc_file():
             pass
     return None
 
+# Most recently opened IFC library: (path, modification time, ifcopenshell file)
+_library_cache = None
+
+def open_library_file(library_path: str):
+    """Open an IFC library file, reusing the parsed file while it is unchanged on disk
+    
+    Library files are only read from, so the same file object can be used for
+    repeated imports of the same library. Only the last opened library is kept.
+    If the library is the file currently open in Bonsai, that file is used.
+    
+    Args:
+        library_path: Path to the IFC library file
+        
+    Returns:
+        The opened IFC file
+    """
+    global _library_cache
+    library_path = os.path.abspath(library_path)
+    
+    # The library may be the file that is already open in Bonsai
+    try:
+        import bonsai.tool as tool
+        active_path = tool.Ifc.get_path()
+        if active_path and os.path.abspath(active_path) == library_path:
+            active_ifc = tool.Ifc.get()
+            if active_ifc is not None:
+                print(f"[eLCA] Using the IFC file open in Bonsai as library: {library_path}")
+                return active_ifc
+    except Exception:
+        pass
+    
+    mtime = os.path.getmtime(library_path)
+    
+    if _library_cache is not None and _library_cache[0] == library_path and _library_cache[1] == mtime:
+        print(f"[eLCA] Using already opened library: {library_path}")
+        return _library_cache[2]
+    
+    library_ifc = ifcopenshell.open(library_path)
+    _library_cache = (library_path, mtime, library_ifc)
+    return library_ifc
+
+def _dump_info(info):
+    """Serialize layer or constituent information for storing it on a Blender material"""
+    return json.dumps(info, separators=(',', ':'))
+
+def _load_info(value):
+    """Read layer or constituent information stored on a Blender material
+    
+    Args:
+        value: Stored information, a JSON string or an already parsed list
+        
+    Returns:
+        List of layer or constituent dictionaries
+    """
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except ValueError:
+        # Materials created by earlier versions store the Python representation
+        return ast.literal_eval(value)
+
+def _material_names():
+    """Get the names of all Blender materials as a set for fast membership checks"""
+    return {mat.name for mat in bpy.data.materials}
+
 def add_material_sets_to_project(source_ifc_file=None) -> None:
     """Add IfcMaterialLayerSets and IfcMaterialConstituentsSets to the active project
     
@@ -45,7 +122,7 @@ def add_material_sets_to_project(source_ifc_file=None) -> None:
         return
     
     # Use source file if provided, otherwise use active file
-    ifc_file = source_ifc_file if source_ifc_file else active_ifc
+    ifc_file = source_ifc_file or active_ifc
     
     if not ifc_file:
         print("[eLCA] No IFC file available")
@@ -61,24 +138,27 @@ def add_material_sets_to_project(source_ifc_file=None) -> None:
         
         # If we're copying from a source file, we need to copy the entities
         if source_ifc_file and source_ifc_file != active_ifc:
+            # Index the existing entities by name once, instead of scanning them for every copy
+            layer_set_index = _index_by_name(active_ifc.by_type("IfcMaterialLayerSet"), 'LayerSetName')
+            constituent_set_index = _index_by_name(active_ifc.by_type("IfcMaterialConstituentSet"))
+            material_index = _index_by_name(active_ifc.by_type("IfcMaterial"))
+            
             # Copy material layer sets
             for layer_set in material_layer_sets:
-                copy_material_layer_set_to_project(layer_set, source_ifc_file, active_ifc)
+                copy_material_layer_set_to_project(layer_set, source_ifc_file, active_ifc,
+                                                   layer_set_index, material_index)
             
             # Copy material constituent sets
             for constituent_set in material_constituent_sets:
-                copy_material_constituent_set_to_project(constituent_set, source_ifc_file, active_ifc)
+                copy_material_constituent_set_to_project(constituent_set, source_ifc_file, active_ifc,
+                                                         constituent_set_index, material_index)
         else:
-            # Add material layer sets to Blender materials
-            for layer_set in material_layer_sets:
-                add_material_layer_set_to_blender(layer_set)
-            
-            # Add material constituent sets to Blender materials
-            for constituent_set in material_constituent_sets:
-                add_material_constituent_set_to_blender(constituent_set)
+            # Add material layer sets and constituent sets to Blender materials
+            _add_sets_to_blender(material_layer_sets, material_constituent_sets, _material_names())
         
-        # Refresh the BlenderBIM interface
-        refresh_bim_interface()
+        # Refresh the BlenderBIM interface if any material set was added
+        if material_layer_sets or material_constituent_sets:
+            refresh_bim_interface()
         
         print("[eLCA] Successfully added material sets to project")
         
@@ -86,64 +166,115 @@ def add_material_sets_to_project(source_ifc_file=None) -> None:
         print(f"[eLCA] Error adding material sets to project: {str(e)}")
         traceback.print_exc()
 
-def copy_material_layer_set_to_project(layer_set, source_ifc, target_ifc):
-    """Copy a material layer set from source IFC to target IFC"""
+def _index_by_name(entities, attribute='Name'):
+    """Map entity names to entities, keeping the first entity for duplicate names
+    
+    Args:
+        entities: IFC entities to index
+        attribute: Name of the attribute holding the entity name
+        
+    Returns:
+        Dictionary mapping names to entities
+    """
+    index = {}
+    for entity in entities:
+        index.setdefault(getattr(entity, attribute, None), entity)
+    return index
+
+def _set_attributes(entity, names):
+    """Collect the attributes of an entity that are present and set
+    
+    Args:
+        entity: IFC entity to read from
+        names: Attribute names to collect
+        
+    Returns:
+        Dictionary of the set attributes, to be passed to create_entity
+    """
+    attributes = {}
+    for name in names:
+        value = getattr(entity, name, None)
+        if value:
+            attributes[name] = value
+    return attributes
+
+def _copy_part(part, base_type, target_ifc, copied_materials):
+    """Copy a material layer or constituent with all its attributes to the target file
+    
+    The copy keeps the actual type of the part (e.g. IfcMaterialLayerWithOffsets) if the
+    target schema declares it and falls back to base_type otherwise. Only attributes
+    declared for the created type in the target schema are copied.
+    
+    Args:
+        part: IfcMaterialLayer or IfcMaterialConstituent to copy
+        base_type: Type to create if the type of part is not declared in the target schema
+        target_ifc: IFC file to copy the part to
+        copied_materials: Mapping of source material IDs to the copied materials in the target file
+        
+    Returns:
+        The created entity
+    """
+    schema = ifcopenshell.ifcopenshell_wrapper.schema_by_name(target_ifc.schema)
+    entity_type = part.is_a()
+    try:
+        declaration = schema.declaration_by_name(entity_type)
+    except RuntimeError:
+        entity_type = base_type
+        declaration = schema.declaration_by_name(entity_type)
+    declared = {attribute.name() for attribute in declaration.all_attributes()}
+    
+    info = part.get_info(include_identifier=False, recursive=False)
+    attributes = {name: value for name, value in info.items() if name in declared and value is not None}
+    material = info.get('Material')
+    attributes['Material'] = copied_materials.get(material.id()) if material else None
+    return target_ifc.create_entity(entity_type, **attributes)
+
+def copy_material_layer_set_to_project(layer_set, source_ifc, target_ifc, layer_set_index=None, material_index=None):
+    """Copy a material layer set from source IFC to target IFC
+    
+    Args:
+        layer_set: Material layer set to copy
+        source_ifc: IFC file containing the layer set
+        target_ifc: IFC file to copy the layer set to
+        layer_set_index: Optional name index of the layer sets in target_ifc, updated with the copy
+        material_index: Optional name index of the materials in target_ifc, updated with copied materials
+    """
     try:
+        if layer_set_index is None:
+            layer_set_index = _index_by_name(target_ifc.by_type("IfcMaterialLayerSet"), 'LayerSetName')
+        if material_index is None:
+            material_index = _index_by_name(target_ifc.by_type("IfcMaterial"))
+        
         # Check if it already exists
-        existing_sets = [ls for ls in target_ifc.by_type("IfcMaterialLayerSet") 
-                        if getattr(ls, 'LayerSetName', None) == getattr(layer_set, 'LayerSetName', None)]
+        existing_set = layer_set_index.get(getattr(layer_set, 'LayerSetName', None))
         
-        if existing_sets:
+        if existing_set is not None:
             print(f"[eLCA] Material layer set '{getattr(layer_set, 'LayerSetName', 'Unnamed')}' already exists")
-            return existing_sets[0]
+            return existing_set
         
-        # Copy materials first
+        # Copy materials first, keyed by their IDs in the source file
+        material_layers = getattr(layer_set, 'MaterialLayers', None) or ()
         copied_materials = {}
-        if hasattr(layer_set, 'MaterialLayers') and layer_set.MaterialLayers:
-            for layer in layer_set.MaterialLayers:
-                if layer.Material and layer.Material not in copied_materials:
-                    copied_material = copy_material_to_project(layer.Material, source_ifc, target_ifc)
-                    copied_materials[layer.Material] = copied_material
-        
-        # Create new material layer set in target IFC
-        new_layer_set = target_ifc.create_entity("IfcMaterialLayerSet")
+        for layer in material_layers:
+            material = layer.Material
+            if material and material.id() not in copied_materials:
+                copied_materials[material.id()] = copy_material_to_project(material, source_ifc, target_ifc, material_index)
         
-        # Copy basic properties
-        if hasattr(layer_set, 'LayerSetName') and layer_set.LayerSetName:
-            new_layer_set.LayerSetName = layer_set.LayerSetName
-        if hasattr(layer_set, 'Description') and layer_set.Description:
-            new_layer_set.Description = layer_set.Description
+        # Create new material layer set in target IFC with its basic properties
+        new_layer_set = target_ifc.create_entity(
+            "IfcMaterialLayerSet", **_set_attributes(layer_set, ('LayerSetName', 'Description')))
+        layer_set_index.setdefault(new_layer_set.LayerSetName, new_layer_set)
         
         # Copy layers
-        if hasattr(layer_set, 'MaterialLayers') and layer_set.MaterialLayers:
-            new_layers = []
-            for layer in layer_set.MaterialLayers:
-                new_layer = target_ifc.create_entity("IfcMaterialLayer")
-                
-                # Copy layer properties
-                if hasattr(layer, 'LayerThickness'):
-                    new_layer.LayerThickness = layer.LayerThickness
-                if hasattr(layer, 'IsVentilated'):
-                    new_layer.IsVentilated = layer.IsVentilated
-                if hasattr(layer, 'Name') and layer.Name:
-                    new_layer.Name = layer.Name
-                if hasattr(layer, 'Description') and layer.Description:
-                    new_layer.Description = layer.Description
-                if hasattr(layer, 'Category') and layer.Category:
-                    new_layer.Category = layer.Category
-                if hasattr(layer, 'Priority'):
-                    new_layer.Priority = layer.Priority
-                
-                # Assign copied material
-                if layer.Material and layer.Material in copied_materials:
-                    new_layer.Material = copied_materials[layer.Material]
-                
-                new_layers.append(new_layer)
-            
-            new_layer_set.MaterialLayers = new_layers
+        if material_layers:
+            # Copy layer properties and assign the copied materials
+            new_layer_set.MaterialLayers = [
+                _copy_part(layer, "IfcMaterialLayer", target_ifc, copied_materials)
+                for layer in material_layers]
         
-        # Create corresponding Blender material
-        add_material_layer_set_to_blender(new_layer_set)
+        # Create corresponding Blender material, the set stays copied in target_ifc
+        # if this fails, so the error is reported on its own
+        _add_sets_to_blender((new_layer_set,), ())
         
         print(f"[eLCA] Copied material layer set: {getattr(new_layer_set, 'LayerSetName', 'Unnamed')}")
         return new_layer_set
@@ -153,60 +284,53 @@ def copy_material_layer_set_to_project(layer_set, source_ifc, target_ifc):
         traceback.print_exc()
         return None
 
-def copy_material_constituent_set_to_project(constituent_set, source_ifc, target_ifc):
-    """Copy a material constituent set from source IFC to target IFC"""
+def copy_material_constituent_set_to_project(constituent_set, source_ifc, target_ifc,
+                                             constituent_set_index=None, material_index=None):
+    """Copy a material constituent set from source IFC to target IFC
+    
+    Args:
+        constituent_set: Material constituent set to copy
+        source_ifc: IFC file containing the constituent set
+        target_ifc: IFC file to copy the constituent set to
+        constituent_set_index: Optional name index of the constituent sets in target_ifc, updated with the copy
+        material_index: Optional name index of the materials in target_ifc, updated with copied materials
+    """
     try:
+        if constituent_set_index is None:
+            constituent_set_index = _index_by_name(target_ifc.by_type("IfcMaterialConstituentSet"))
+        if material_index is None:
+            material_index = _index_by_name(target_ifc.by_type("IfcMaterial"))
+        
         # Check if it already exists
-        existing_sets = [cs for cs in target_ifc.by_type("IfcMaterialConstituentSet") 
-                        if getattr(cs, 'Name', None) == getattr(constituent_set, 'Name', None)]
+        existing_set = constituent_set_index.get(getattr(constituent_set, 'Name', None))
         
-        if existing_sets:
+        if existing_set is not None:
             print(f"[eLCA] Material constituent set '{getattr(constituent_set, 'Name', 'Unnamed')}' already exists")
-            return existing_sets[0]
+            return existing_set
         
-        # Copy materials first
+        # Copy materials first, keyed by their IDs in the source file
+        material_constituents = getattr(constituent_set, 'MaterialConstituents', None) or ()
         copied_materials = {}
-        if hasattr(constituent_set, 'MaterialConstituents') and constituent_set.MaterialConstituents:
-            for constituent in constituent_set.MaterialConstituents:
-                if constituent.Material and constituent.Material not in copied_materials:
-                    copied_material = copy_material_to_project(constituent.Material, source_ifc, target_ifc)
-                    copied_materials[constituent.Material] = copied_material
+        for constituent in material_constituents:
+            material = constituent.Material
+            if material and material.id() not in copied_materials:
+                copied_materials[material.id()] = copy_material_to_project(material, source_ifc, target_ifc, material_index)
         
-        # Create new material constituent set in target IFC
-        new_constituent_set = target_ifc.create_entity("IfcMaterialConstituentSet")
-        
-        # Copy basic properties
-        if hasattr(constituent_set, 'Name') and constituent_set.Name:
-            new_constituent_set.Name = constituent_set.Name
-        if hasattr(constituent_set, 'Description') and constituent_set.Description:
-            new_constituent_set.Description = constituent_set.Description
+        # Create new material constituent set in target IFC with its basic properties
+        new_constituent_set = target_ifc.create_entity(
+            "IfcMaterialConstituentSet", **_set_attributes(constituent_set, ('Name', 'Description')))
+        constituent_set_index.setdefault(new_constituent_set.Name, new_constituent_set)
         
         # Copy constituents
-        if hasattr(constituent_set, 'MaterialConstituents') and constituent_set.MaterialConstituents:
-            new_constituents = []
-            for constituent in constituent_set.MaterialConstituents:
-                new_constituent = target_ifc.create_entity("IfcMaterialConstituent")
-                
-                # Copy constituent properties
-                if hasattr(constituent, 'Name') and constituent.Name:
-                    new_constituent.Name = constituent.Name
-                if hasattr(constituent, 'Description') and constituent.Description:
-                    new_constituent.Description = constituent.Description
-                if hasattr(constituent, 'Fraction'):
-                    new_constituent.Fraction = constituent.Fraction
-                if hasattr(constituent, 'Category') and constituent.Category:
-                    new_constituent.Category = constituent.Category
-                
-                # Assign copied material
-                if constituent.Material and constituent.Material in copied_materials:
-                    new_constituent.Material = copied_materials[constituent.Material]
-                
-                new_constituents.append(new_constituent)
-            
-            new_constituent_set.MaterialConstituents = new_constituents
+        if material_constituents:
+            # Copy constituent properties and assign the copied materials
+            new_constituent_set.MaterialConstituents = [
+                _copy_part(constituent, "IfcMaterialConstituent", target_ifc, copied_materials)
+                for constituent in material_constituents]
         
-        # Create corresponding Blender material
-        add_material_constituent_set_to_blender(new_constituent_set)
+        # Create corresponding Blender material, the set stays copied in target_ifc
+        # if this fails, so the error is reported on its own
+        _add_sets_to_blender((), (new_constituent_set,))
         
         print(f"[eLCA] Copied material constituent set: {getattr(new_constituent_set, 'Name', 'Unnamed')}")
         return new_constituent_set
@@ -216,142 +340,180 @@ def copy_material_constituent_set_to_project(constituent_set, source_ifc, target
         traceback.print_exc()
         return None
 
-def copy_material_to_project(material, source_ifc, target_ifc):
-    """Copy a material from source IFC to target IFC"""
-    try:
-        # Check if material already exists
-        existing_materials = [m for m in target_ifc.by_type("IfcMaterial") 
-                             if getattr(m, 'Name', None) == getattr(material, 'Name', None)]
-        
-        if existing_materials:
-            return existing_materials[0]
-        
-        # Create new material
-        new_material = target_ifc.create_entity("IfcMaterial")
-        
-        # Copy properties
-        if hasattr(material, 'Name') and material.Name:
-            new_material.Name = material.Name
-        if hasattr(material, 'Description') and material.Description:
-            new_material.Description = material.Description
-        if hasattr(material, 'Category') and material.Category:
-            new_material.Category = material.Category
-        
-        return new_material
-        
-    except Exception as e:
-        print(f"[eLCA] Error copying material: {str(e)}")
-        return None
+def copy_material_to_project(material, source_ifc, target_ifc, material_index=None):
+    """Copy a material from source IFC to target IFC
+    
+    Args:
+        material: Material to copy
+        source_ifc: IFC file containing the material
+        target_ifc: IFC file to copy the material to
+        material_index: Optional name index of the materials in target_ifc, updated with the copy
+    """
+    if material_index is None:
+        material_index = _index_by_name(target_ifc.by_type("IfcMaterial"))
+    
+    # Check if material already exists
+    existing_material = material_index.get(getattr(material, 'Name', None))
+    
+    if existing_material is not None:
+        return existing_material
+    
+    # Create new material with its properties
+    new_material = target_ifc.create_entity(
+        "IfcMaterial", **_set_attributes(material, ('Name', 'Description', 'Category')))
+    material_index.setdefault(new_material.Name, new_material)
+    
+    return new_material
 
-def add_material_layer_set_to_blender(layer_set):
-    """Add a material layer set to Blender materials"""
-    try:
-        # Get or create material set name
-        set_name = getattr(layer_set, 'LayerSetName', None) or f"MaterialLayerSet_{layer_set.id()}"
-        
-        # Check if material set already exists
-        if set_name in bpy.data.materials:
-            print(f"[eLCA] Material layer set '{set_name}' already exists in Blender, skipping")
-            return
+def add_material_layer_set_to_blender(layer_set, existing=None):
+    """Add a material layer set to Blender materials
+    
+    Args:
+        layer_set: IFC material layer set to add
+        existing: Optional set of Blender material names, updated with the new material
+    """
+    # Get or create material set name
+    set_name = getattr(layer_set, 'LayerSetName', None) or f"MaterialLayerSet_{layer_set.id()}"
+    
+    # Check if material set already exists
+    if set_name in (bpy.data.materials if existing is None else existing):
+        print(f"[eLCA] Material layer set '{set_name}' already exists in Blender, skipping")
+        return
+    
+    # Create a new material for the layer set
+    mat = bpy.data.materials.new(name=set_name)
+    mat.use_nodes = True
+    if existing is not None:
+        existing.add(mat.name)
+    
+    # Add custom properties to store IFC data
+    mat["ifc_type"] = "IfcMaterialLayerSet"
+    mat["ifc_id"] = layer_set.id()
+    
+    # Process individual layers
+    if hasattr(layer_set, 'MaterialLayers') and layer_set.MaterialLayers:
+        layer_info = []
+        total_thickness = 0.0
         
-        # Create a new material for the layer set
-        mat = bpy.data.materials.new(name=set_name)
-        mat.use_nodes = True
+        for i, layer in enumerate(layer_set.MaterialLayers):
+            layer_thickness = getattr(layer, 'LayerThickness', 0.0)
+            total_thickness += layer_thickness
+            
+            # Read the material once, getattr falls back to the defaults if it is not set
+            material = layer.Material
+            layer_data = {
+                'name': getattr(material, 'Name', f'Layer_{i}'),
+                'thickness': layer_thickness,
+                'category': getattr(material, 'Category', ''),
+                'description': getattr(material, 'Description', '')
+            }
+            layer_info.append(layer_data)
         
-        # Add custom properties to store IFC data
-        mat["ifc_type"] = "IfcMaterialLayerSet"
-        mat["ifc_id"] = layer_set.id()
+        # Store layer information as custom properties
+        mat["layer_info"] = _dump_info(layer_info)
+        mat["total_thickness"] = total_thickness
+        mat["layer_count"] = len(layer_info)
         
-        # Process individual layers
-        if hasattr(layer_set, 'MaterialLayers') and layer_set.MaterialLayers:
-            layer_info = []
-            total_thickness = 0.0
-            
-            for i, layer in enumerate(layer_set.MaterialLayers):
-                layer_thickness = getattr(layer, 'LayerThickness', 0.0)
-                total_thickness += layer_thickness
-                
-                layer_data = {
-                    'name': getattr(layer.Material, 'Name', f'Layer_{i}') if layer.Material else f'Layer_{i}',
-                    'thickness': layer_thickness,
-                    'category': getattr(layer.Material, 'Category', '') if layer.Material else '',
-                    'description': getattr(layer.Material, 'Description', '') if layer.Material else ''
-                }
-                layer_info.append(layer_data)
-            
-            # Store layer information as custom properties
-            mat["layer_info"] = str(layer_info)
-            mat["total_thickness"] = total_thickness
-            mat["layer_count"] = len(layer_info)
+    print(f"[eLCA] Added material layer set to Blender: {set_name}")
+
+def add_material_constituent_set_to_blender(constituent_set, existing=None):
+    """Add a material constituent set to Blender materials
+    
+    Args:
+        constituent_set: IFC material constituent set to add
+        existing: Optional set of Blender material names, updated with the new material
+    """
+    # Get or create material set name
+    set_name = getattr(constituent_set, 'Name', None) or f"MaterialConstituentSet_{constituent_set.id()}"
+    
+    # Check if material set already exists
+    if set_name in (bpy.data.materials if existing is None else existing):
+        print(f"[eLCA] Material constituent set '{set_name}' already exists in Blender, skipping")
+        return
+    
+    # Create a new material for the constituent set
+    mat = bpy.data.materials.new(name=set_name)
+    mat.use_nodes = True
+    if existing is not None:
+        existing.add(mat.name)
+    
+    # Add custom properties to store IFC data
+    mat["ifc_type"] = "IfcMaterialConstituentSet"
+    mat["ifc_id"] = constituent_set.id()
+    
+    # Process individual constituents
+    if hasattr(constituent_set, 'MaterialConstituents') and constituent_set.MaterialConstituents:
+        constituent_info = []
+        total_fraction = 0.0
+        
+        for i, constituent in enumerate(constituent_set.MaterialConstituents):
+            fraction = getattr(constituent, 'Fraction', 0.0)
+            total_fraction += fraction
             
-        print(f"[eLCA] Added material layer set to Blender: {set_name}")
+            # Read the material once, getattr falls back to the defaults if it is not set
+            material = constituent.Material
+            constituent_data = {
+                'name': getattr(constituent, 'Name', f'Constituent_{i}'),
+                'material_name': getattr(material, 'Name', ''),
+                'fraction': fraction,
+                'category': getattr(material, 'Category', ''),
+                'description': getattr(material, 'Description', '')
+            }
+            constituent_info.append(constituent_data)
         
-    except Exception as e:
-        print(f"[eLCA] Error adding material layer set to Blender: {str(e)}")
-        traceback.print_exc()
+        # Store constituent information as custom properties
+        mat["constituent_info"] = _dump_info(constituent_info)
+        mat["total_fraction"] = total_fraction
+        mat["constituent_count"] = len(constituent_info)
+        
+    print(f"[eLCA] Added material constituent set to Blender: {set_name}")
 
-def add_material_constituent_set_to_blender(constituent_set):
-    """Add a material constituent set to Blender materials"""
-    try:
-        # Get or create material set name
-        set_name = getattr(constituent_set, 'Name', None) or f"MaterialConstituentSet_{constituent_set.id()}"
-        
-        # Check if material set already exists
-        if set_name in bpy.data.materials:
-            print(f"[eLCA] Material constituent set '{set_name}' already exists in Blender, skipping")
-            return
-        
-        # Create a new material for the constituent set
-        mat = bpy.data.materials.new(name=set_name)
-        mat.use_nodes = True
-        
-        # Add custom properties to store IFC data
-        mat["ifc_type"] = "IfcMaterialConstituentSet"
-        mat["ifc_id"] = constituent_set.id()
-        
-        # Process individual constituents
-        if hasattr(constituent_set, 'MaterialConstituents') and constituent_set.MaterialConstituents:
-            constituent_info = []
-            total_fraction = 0.0
-            
-            for i, constituent in enumerate(constituent_set.MaterialConstituents):
-                fraction = getattr(constituent, 'Fraction', 0.0)
-                total_fraction += fraction
-                
-                constituent_data = {
-                    'name': getattr(constituent, 'Name', f'Constituent_{i}'),
-                    'material_name': getattr(constituent.Material, 'Name', '') if constituent.Material else '',
-                    'fraction': fraction,
-                    'category': getattr(constituent.Material, 'Category', '') if constituent.Material else '',
-                    'description': getattr(constituent.Material, 'Description', '') if constituent.Material else ''
-                }
-                constituent_info.append(constituent_data)
-            
-            # Store constituent information as custom properties
-            mat["constituent_info"] = str(constituent_info)
-            mat["total_fraction"] = total_fraction
-            mat["constituent_count"] = len(constituent_info)
-            
-        print(f"[eLCA] Added material constituent set to Blender: {set_name}")
+def _add_sets_to_blender(layer_sets, constituent_sets, existing=None):
+    """Add material layer sets and constituent sets to Blender materials
+    
+    A set that fails to be added is reported and skipped, so the remaining sets are still added.
+    
+    Args:
+        layer_sets: IFC material layer sets to add
+        constituent_sets: IFC material constituent sets to add
+        existing: Optional set of Blender material names, updated with the new materials
         
-    except Exception as e:
-        print(f"[eLCA] Error adding material constituent set to Blender: {str(e)}")
-        traceback.print_exc()
+    Returns:
+        True if all sets were added, False if any set was skipped
+    """
+    success = True
+    for layer_set in layer_sets:
+        try:
+            add_material_layer_set_to_blender(layer_set, existing)
+        except Exception as e:
+            print(f"[eLCA] Error adding material layer set to Blender: {str(e)}")
+            traceback.print_exc()
+            success = False
+    
+    for constituent_set in constituent_sets:
+        try:
+            add_material_constituent_set_to_blender(constituent_set, existing)
+        except Exception as e:
+            print(f"[eLCA] Error adding material constituent set to Blender: {str(e)}")
+            traceback.print_exc()
+            success = False
+    
+    return success
 
 def refresh_bim_interface():
     """Refresh the BlenderBIM interface to show new materials"""
+    # There is nothing to redraw without a screen, e.g. in background mode
+    screen = bpy.context.screen
+    if screen is None:
+        return
+    
     try:
-        # Try to refresh BlenderBIM materials
+        # Refresh the material properties if Bonsai provides them, and the 3D viewport
         import bonsai.tool as tool
-        if hasattr(tool, 'Material'):
-            # Force refresh of material data
-            for area in bpy.context.screen.areas:
-                if area.type == 'PROPERTIES':
-                    area.tag_redraw()
-        
-        # Also refresh the 3D viewport
-        for area in bpy.context.screen.areas:
-            if area.type == 'VIEW_3D':
+        redraw_types = {'PROPERTIES', 'VIEW_3D'} if hasattr(tool, 'Material') else {'VIEW_3D'}
+        
+        for area in screen.areas:
+            if area.type in redraw_types:
                 area.tag_redraw()
                 
         print("[eLCA] Refreshed BlenderBIM interface")
@@ -367,7 +529,7 @@ def add_material_sets_from_library_file(library_file_path: str) -> None:
     """
     try:
         # Open the library file
-        library_ifc = ifcopenshell.open(library_file_path)
+        library_ifc = open_library_file(library_file_path)
         
         # Add material sets from the library to the active project
         add_material_sets_to_project(library_ifc)
@@ -378,6 +540,9 @@ def add_material_sets_from_library_file(library_file_path: str) -> None:
         print(f"[eLCA] Error adding material sets from library: {str(e)}")
         traceback.print_exc()
 
+# IFC types of the material sets represented by Blender materials
+_MATERIAL_SET_TYPES = frozenset(("IfcMaterialLayerSet", "IfcMaterialConstituentSet"))
+
 def update_material_sets_in_project(elca_data: Optional[Dict[str, Any]] = None) -> None:
     """Update existing material sets with new eLCA data
     
@@ -386,14 +551,13 @@ def update_material_sets_in_project(elca_data: Optional[Dict[str, Any]] = None)
     """
     try:
         # Get all materials with IFC material set types
-        ifc_materials = [mat for mat in bpy.data.materials 
-                        if "ifc_type" in mat and mat["ifc_type"] in ["IfcMaterialLayerSet", "IfcMaterialConstituentSet"]]
+        ifc_materials = [mat for mat, ifc_type in _ifc_materials() if ifc_type in _MATERIAL_SET_TYPES]
         
         print(f"[eLCA] Found {len(ifc_materials)} existing IFC material sets to update")
         
         # Update each material with new eLCA data if available
-        for mat in ifc_materials:
-            if elca_data:
+        if elca_data:
+            for mat in ifc_materials:
                 update_material_with_elca_data(mat, elca_data)
             
     except Exception as e:
@@ -411,11 +575,12 @@ def update_material_with_elca_data(material, elca_data: Dict[str, Any]) -> None:
         material_name = material.name
         ifc_id = material.get("ifc_id")
         
-        # Look for matching eLCA data
-        if material_name in elca_data or str(ifc_id) in elca_data:
-            data_key = material_name if material_name in elca_data else str(ifc_id)
-            material_elca_data = elca_data[data_key]
-            
+        # Look for matching eLCA data, by name first and then by IFC ID
+        material_elca_data = elca_data.get(material_name)
+        if material_elca_data is None:
+            material_elca_data = elca_data.get(str(ifc_id))
+        
+        if material_elca_data is not None:
             # Add eLCA properties
             for key, value in material_elca_data.items():
                 material[f"elca_{key}"] = value
@@ -425,6 +590,17 @@ def update_material_with_elca_data(material, elca_data: Dict[str, Any]) -> None:
     except Exception as e:
         print(f"[eLCA] Error updating material with eLCA data: {str(e)}")
 
+def _ifc_materials():
+    """Iterate over the Blender materials that represent IFC material sets
+    
+    Yields:
+        Tuples of the material and its IFC type
+    """
+    for mat in bpy.data.materials:
+        ifc_type = mat.get("ifc_type")
+        if ifc_type is not None:
+            yield mat, ifc_type
+
 def get_material_sets_summary() -> Dict[str, Any]:
     """Get a summary of all material sets in the project
     
@@ -435,18 +611,15 @@ def get_material_sets_summary() -> Dict[str, Any]:
         layer_sets = []
         constituent_sets = []
         
-        for mat in bpy.data.materials:
-            if "ifc_type" not in mat:
-                continue
-                
-            if mat["ifc_type"] == "IfcMaterialLayerSet":
+        for mat, ifc_type in _ifc_materials():
+            if ifc_type == "IfcMaterialLayerSet":
                 layer_sets.append({
                     'name': mat.name,
                     'ifc_id': mat.get("ifc_id"),
                     'layer_count': mat.get("layer_count", 0),
                     'total_thickness': mat.get("total_thickness", 0.0)
                 })
-            elif mat["ifc_type"] == "IfcMaterialConstituentSet":
+            elif ifc_type == "IfcMaterialConstituentSet":
                 constituent_sets.append({
                     'name': mat.name,
                     'ifc_id': mat.get("ifc_id"),
@@ -483,62 +656,98 @@ def remove_material_sets_from_project(material_type: Optional[str] = None) -> No
                 materials_to_remove.append(mat)
         
         for mat in materials_to_remove:
-            print(f"[eLCA] Removing material set: {mat.name}")
-            bpy.data.materials.remove(mat)
+            log.debug("Removing material set: %s", mat.name)
+        # Remove all materials in one pass instead of one update per material
+        bpy.data.batch_remove(materials_to_remove)
         
         print(f"[eLCA] Removed {len(materials_to_remove)} material sets")
         
-        # Refresh interface after removal
-        refresh_bim_interface()
+        # Refresh interface after removal, nothing to redraw if no material was removed
+        if materials_to_remove:
+            refresh_bim_interface()
         
     except Exception as e:
         print(f"[eLCA] Error removing material sets: {str(e)}")
         traceback.print_exc()
 
+def _iter_validation_issues():
+    """Yield the validation issues of each material set that has any
+    
+    Yields:
+        Dictionaries with the material name, material type and its issues
+    """
+    for mat, ifc_type in _ifc_materials():
+        material_issues = []
+        
+        # Check for required properties
+        if "ifc_id" not in mat:
+            material_issues.append("Missing IFC ID")
+        
+        if ifc_type == "IfcMaterialLayerSet":
+            if "layer_info" not in mat:
+                material_issues.append("Missing layer information")
+            elif mat.get("layer_count", 0) == 0:
+                material_issues.append("No layers defined")
+                
+        elif ifc_type == "IfcMaterialConstituentSet":
+            if "constituent_info" not in mat:
+                material_issues.append("Missing constituent information")
+            elif mat.get("constituent_count", 0) == 0:
+                material_issues.append("No constituents defined")
+        
+        if material_issues:
+            yield {
+                'material_name': mat.name,
+                'material_type': ifc_type,
+                'issues': material_issues
+            }
+
 def validate_material_sets() -> List[Dict[str, Any]]:
     """Validate material sets and return any issues found
     
     Returns:
         List of dictionaries containing validation issues
     """
-    issues = []
-    
     try:
-        for mat in bpy.data.materials:
-            if "ifc_type" not in mat:
-                continue
-            
-            material_issues = []
-            
-            # Check for required properties
-            if "ifc_id" not in mat:
-                material_issues.append("Missing IFC ID")
-            
-            if mat["ifc_type"] == "IfcMaterialLayerSet":
-                if "layer_info" not in mat:
-                    material_issues.append("Missing layer information")
-                elif mat.get("layer_count", 0) == 0:
-                    material_issues.append("No layers defined")
-                    
-            elif mat["ifc_type"] == "IfcMaterialConstituentSet":
-                if "constituent_info" not in mat:
-                    material_issues.append("Missing constituent information")
-                elif mat.get("constituent_count", 0) == 0:
-                    material_issues.append("No constituents defined")
-            
-            if material_issues:
-                issues.append({
-                    'material_name': mat.name,
-                    'material_type': mat["ifc_type"],
-                    'issues': material_issues
-                })
-        
-        return issues
+        return list(_iter_validation_issues())
         
     except Exception as e:
         print(f"[eLCA] Error validating material sets: {str(e)}")
         return [{'error': str(e)}]
 
+def _ifc_file_identity(ifc_file):
+    """Identify an IFC file by its path in Bonsai, or by the file object if it has no path"""
+    try:
+        import bonsai.tool as tool
+        if tool.Ifc.get() is ifc_file:
+            path = tool.Ifc.get_path()
+            if path:
+                return os.path.abspath(path)
+    except Exception:
+        pass
+    return f"id:{id(ifc_file)}"
+
+def _sync_fingerprint(active_ifc, ifc_layer_sets, ifc_constituent_sets):
+    """Summarize the state compared by sync_material_sets_with_ifc to detect changes
+    
+    Args:
+        active_ifc: The active IFC file
+        ifc_layer_sets: Material layer sets in the IFC file
+        ifc_constituent_sets: Material constituent sets in the IFC file
+        
+    Returns:
+        Hash of the IFC file identity, the IDs and names of its material sets and
+        the names and IFC IDs of the material set materials in Blender
+    """
+    fingerprint = hashlib.sha1(_ifc_file_identity(active_ifc).encode())
+    for layer_set in ifc_layer_sets:
+        fingerprint.update(f"\0L{layer_set.id()}:{layer_set.LayerSetName}".encode())
+    for constituent_set in ifc_constituent_sets:
+        fingerprint.update(f"\0C{constituent_set.id()}:{constituent_set.Name}".encode())
+    for mat, ifc_type in _ifc_materials():
+        fingerprint.update(f"\0B{mat.name}:{ifc_type}:{mat.get('ifc_id')}".encode())
+    return fingerprint.hexdigest()
+
 def sync_material_sets_with_ifc():
     """Synchronize Blender material sets with the active IFC file"""
     try:
@@ -553,18 +762,29 @@ def sync_material_sets_with_ifc():
         
         print(f"[eLCA] Found {len(ifc_layer_sets)} layer sets and {len(ifc_constituent_sets)} constituent sets in IFC")
         
-        # Create Blender materials for any missing IFC material sets
-        for layer_set in ifc_layer_sets:
-            add_material_layer_set_to_blender(layer_set)
+        ifc_ids = {entity.id() for entity in ifc_layer_sets}
+        ifc_ids.update(entity.id() for entity in ifc_constituent_sets)
+        
+        # Nothing to do if neither the IFC material sets nor the Blender materials changed since the last sync
+        scene = bpy.context.scene
+        if scene.get("elca_sync_fingerprint") == _sync_fingerprint(active_ifc, ifc_layer_sets, ifc_constituent_sets):
+            print("[eLCA] Material sets are already synchronized with IFC file")
+            return True
         
-        for constituent_set in ifc_constituent_sets:
-            add_material_constituent_set_to_blender(constituent_set)
+        # Create Blender materials for any missing IFC material sets
+        all_added = _add_sets_to_blender(ifc_layer_sets, ifc_constituent_sets, _material_names())
         
-        # Remove Blender materials that no longer exist in IFC
-        cleanup_orphaned_material_sets(active_ifc)
+        # Remove Blender materials that no longer exist in IFC, reusing the sets found above
+        cleanup_orphaned_material_sets(active_ifc, ifc_ids)
         
         refresh_bim_interface()
         
+        # Sets that failed to be added are tried again by the next sync
+        if all_added:
+            scene["elca_sync_fingerprint"] = _sync_fingerprint(active_ifc, ifc_layer_sets, ifc_constituent_sets)
+        elif "elca_sync_fingerprint" in scene:
+            del scene["elca_sync_fingerprint"]
+        
         print("[eLCA] Synchronized material sets with IFC file")
         return True
         
@@ -573,13 +793,18 @@ def sync_material_sets_with_ifc():
         traceback.print_exc()
         return False
 
-def cleanup_orphaned_material_sets(active_ifc):
-    """Remove Blender materials that don't exist in the IFC file"""
+def cleanup_orphaned_material_sets(active_ifc, ifc_ids=None):
+    """Remove Blender materials that don't exist in the IFC file
+    
+    Args:
+        active_ifc: The active IFC file
+        ifc_ids: Optional IDs of the material sets in active_ifc, collected from the file if not given
+    """
     try:
         # Get all IFC IDs from the active file
-        ifc_ids = set()
-        for entity in active_ifc.by_type("IfcMaterialLayerSet") + active_ifc.by_type("IfcMaterialConstituentSet"):
-            ifc_ids.add(entity.id())
+        if ifc_ids is None:
+            ifc_ids = {entity.id() for entity in chain(active_ifc.by_type("IfcMaterialLayerSet"),
+                                                       active_ifc.by_type("IfcMaterialConstituentSet"))}
         
         # Check Blender materials
         materials_to_remove = []
@@ -588,10 +813,10 @@ def cleanup_orphaned_material_sets(active_ifc):
                 if mat["ifc_id"] not in ifc_ids:
                     materials_to_remove.append(mat)
         
-        # Remove orphaned materials
+        # Remove orphaned materials in one pass
         for mat in materials_to_remove:
-            print(f"[eLCA] Removing orphaned material: {mat.name}")
-            bpy.data.materials.remove(mat)
+            log.debug("Removing orphaned material: %s", mat.name)
+        bpy.data.batch_remove(materials_to_remove)
         
         if materials_to_remove:
             print(f"[eLCA] Cleaned up {len(materials_to_remove)} orphaned materials")
@@ -617,14 +842,15 @@ def create_material_from_elca_component(component_data: Dict[str, Any]) -> Optio
         # Create unique material name
         material_name = f"eLCA_{component_name}_{component_type}"
         
-        # Check if material already exists
-        if material_name in bpy.data.materials:
+        # Check if material already exists, looking it up only once
+        mat = bpy.data.materials.get(material_name)
+        if mat is not None:
             print(f"[eLCA] Material '{material_name}' already exists, updating")
-            mat = bpy.data.materials[material_name]
         else:
             # Create new material
             mat = bpy.data.materials.new(name=material_name)
             mat.use_nodes = True
+            mat["_elca_has_env_component"] = False
             print(f"[eLCA] Created new material: {material_name}")
         
         # Add eLCA properties
@@ -637,6 +863,9 @@ def create_material_from_elca_component(component_data: Dict[str, Any]) -> Optio
             env_data = component_data['environmental_data']
             for key, value in env_data.items():
                 mat[f"elca_{key}"] = value
+            # Flag read by get_elca_materials_summary instead of scanning all keys
+            if env_data:
+                mat["_elca_has_env_component"] = True
         
         # Add material properties if available
         if 'properties' in component_data:
@@ -671,14 +900,15 @@ def create_material_layer_set_from_elca_element(element_data: Dict[str, Any]) ->
         # Create material layer set name
         layer_set_name = f"eLCA_LayerSet_{element_name}"
         
-        # Check if material already exists
-        if layer_set_name in bpy.data.materials:
+        # Check if material already exists, looking it up only once
+        mat = bpy.data.materials.get(layer_set_name)
+        if mat is not None:
             print(f"[eLCA] Material layer set '{layer_set_name}' already exists, updating")
-            mat = bpy.data.materials[layer_set_name]
         else:
             # Create new material
             mat = bpy.data.materials.new(name=layer_set_name)
             mat.use_nodes = True
+            mat["_elca_has_env_element"] = False
             print(f"[eLCA] Created new material layer set: {layer_set_name}")
         
         # Add eLCA properties
@@ -711,7 +941,7 @@ def create_material_layer_set_from_elca_element(element_data: Dict[str, Any]) ->
                     layer_data[f"elca_{key}"] = value
         
         # Store layer information as custom properties
-        mat["layer_info"] = str(layer_info)
+        mat["layer_info"] = _dump_info(layer_info)
         mat["total_thickness"] = total_thickness
         mat["layer_count"] = len(layer_info)
         
@@ -720,6 +950,9 @@ def create_material_layer_set_from_elca_element(element_data: Dict[str, Any]) ->
             env_data = element_data['environmental_data']
             for key, value in env_data.items():
                 mat[f"elca_total_{key}"] = value
+            # Flag read by get_elca_materials_summary instead of scanning all keys
+            if env_data:
+                mat["_elca_has_env_element"] = True
         
         return layer_set_name
         
@@ -748,27 +981,41 @@ def export_material_sets_to_ifc(output_path: str) -> bool:
         layer_sets = []
         constituent_sets = []
         
-        for mat in bpy.data.materials:
-            if "ifc_type" not in mat:
-                continue
-                
-            if mat["ifc_type"] == "IfcMaterialLayerSet":
+        for mat, ifc_type in _ifc_materials():
+            if ifc_type == "IfcMaterialLayerSet":
                 layer_sets.append(mat)
-            elif mat["ifc_type"] == "IfcMaterialConstituentSet":
+            elif ifc_type == "IfcMaterialConstituentSet":
                 constituent_sets.append(mat)
         
         print(f"[eLCA] Exporting {len(layer_sets)} layer sets and {len(constituent_sets)} constituent sets")
         
-        # Export material layer sets
+        # Materials shared by several sets are only written once
+        material_cache = {}
+        
+        # Export material layer sets, a set that fails to export is skipped
         for mat in layer_sets:
-            export_material_layer_set_to_ifc(mat, ifc_file)
+            try:
+                export_material_layer_set_to_ifc(mat, ifc_file, material_cache)
+            except Exception as e:
+                log.warning("Skipping material layer set %s: %s", mat.name, e)
         
         # Export material constituent sets
         for mat in constituent_sets:
-            export_material_constituent_set_to_ifc(mat, ifc_file)
-        
-        # Write the IFC file
-        ifc_file.write(output_path)
+            try:
+                export_material_constituent_set_to_ifc(mat, ifc_file, material_cache)
+            except Exception as e:
+                log.warning("Skipping material constituent set %s: %s", mat.name, e)
+        
+        # Write the IFC file to a temporary file first and move it into place once it is
+        # complete, so a failed export never leaves a truncated file at output_path
+        temp_path = output_path + ".tmp"
+        try:
+            ifc_file.write(temp_path, format=ifcopenshell.guess_format(Path(output_path)))
+            os.replace(temp_path, output_path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
         print(f"[eLCA] Exported material sets to: {output_path}")
         
         return True
@@ -779,138 +1026,130 @@ def export_material_sets_to_ifc(output_path: str) -> bool:
         return False
 
 def create_basic_ifc_structure(ifc_file):
-    """Create basic IFC file structure"""
+    """Create basic IFC file structure
+    
+    OwnerHistory is optional in IFC4 and carries no information for a material
+    library, so only the project is created.
+    
+    Args:
+        ifc_file: IFC file to add the structure to
+        
+    Returns:
+        The created IfcProject or None if creation failed
+    """
     try:
-        # Create basic entities required for IFC file
-        person = ifc_file.create_entity("IfcPerson")
-        person.FamilyName = "eLCA"
-        person.GivenName = "Integration"
-        
-        organization = ifc_file.create_entity("IfcOrganization")
-        organization.Name = "eLCA Bonsai Integration"
-        
-        person_and_organization = ifc_file.create_entity("IfcPersonAndOrganization")
-        person_and_organization.ThePerson = person
-        person_and_organization.TheOrganization = organization
-        
-        application = ifc_file.create_entity("IfcApplication")
-        application.ApplicationDeveloper = organization
-        application.Version = "1.0"
-        application.ApplicationFullName = "eLCA Bonsai Integration"
-        application.ApplicationIdentifier = "eLCA"
-        
-        # Create ownership history
-        ownership_history = ifc_file.create_entity("IfcOwnerHistory")
-        ownership_history.OwningUser = person_and_organization
-        ownership_history.OwningApplication = application
-        ownership_history.ChangeAction = "ADDED"
-        
-        # Create project
-        project = ifc_file.create_entity("IfcProject")
-        project.GlobalId = ifcopenshell.guid.new()
-        project.OwnerHistory = ownership_history
-        project.Name = "eLCA Material Library"
-        project.Description = "Material library created from eLCA data"
-        
-        return project
+        return ifc_file.create_entity(
+            "IfcProject", GlobalId=ifcopenshell.guid.new(),
+            Name="eLCA Material Library", Description="Material library created from eLCA data")
         
     except Exception as e:
         print(f"[eLCA] Error creating basic IFC structure: {str(e)}")
         return None
 
-def export_material_layer_set_to_ifc(blender_material, ifc_file):
-    """Export a Blender material layer set to IFC"""
-    try:
-        # Create IfcMaterialLayerSet
-        layer_set = ifc_file.create_entity("IfcMaterialLayerSet")
-        layer_set.LayerSetName = blender_material.name
-        
-        # Get layer information
-        layer_info_str = blender_material.get("layer_info", "[]")
-        try:
-            layer_info = eval(layer_info_str) if isinstance(layer_info_str, str) else layer_info_str
-        except:
-            layer_info = []
-        
-        # Create material layers
-        material_layers = []
-        created_materials = {}
-        
-        for layer_data in layer_info:
-            # Create or get material
-            material_name = layer_data.get('name', 'Unknown')
-            if material_name not in created_materials:
-                material = ifc_file.create_entity("IfcMaterial")
-                material.Name = material_name
-                material.Category = layer_data.get('Category', '')
-                material.Description = layer_data.get('Description', '')
-                created_materials[material_name] = material
-            else:
-                material = created_materials[material_name]
-            
-            # Create material layer
-            layer = ifc_file.create_entity("IfcMaterialLayer")
-            layer.Material = material
-            layer.LayerThickness = layer_data.get('LayerThickness', 0.0)
-            layer.Name = material_name
-            
-            material_layers.append(layer)
-        
-        layer_set.MaterialLayers = material_layers
-        
-        print(f"[eLCA] Exported material layer set: {blender_material.name}")
-        return layer_set
+def _export_material(ifc_file, material_cache, name, category, description):
+    """Get the exported IfcMaterial with the given properties, creating it on first use
+    
+    Args:
+        ifc_file: IFC file being exported
+        material_cache: Materials already created in ifc_file, keyed by (name, category, description)
+        name: Material name
+        category: Material category
+        description: Material description
         
-    except Exception as e:
-        print(f"[eLCA] Error exporting material layer set: {str(e)}")
-        return None
+    Returns:
+        The IfcMaterial entity
+    """
+    key = (name, category, description)
+    material = material_cache.get(key)
+    if material is None:
+        material = ifc_file.create_entity("IfcMaterial", Name=name, Category=category, Description=description)
+        material_cache[key] = material
+    return material
 
-def export_material_constituent_set_to_ifc(blender_material, ifc_file):
-    """Export a Blender material constituent set to IFC"""
+def export_material_layer_set_to_ifc(blender_material, ifc_file, material_cache=None):
+    """Export a Blender material layer set to IFC
+    
+    Args:
+        blender_material: Blender material holding the layer set data
+        ifc_file: IFC file to export to
+        material_cache: Optional materials already exported to ifc_file, shared between sets
+    """
+    # Create IfcMaterialLayerSet
+    layer_set = ifc_file.create_entity("IfcMaterialLayerSet", LayerSetName=blender_material.name)
+    
+    # Get layer information
+    layer_info_str = blender_material.get("layer_info", "[]")
     try:
-        # Create IfcMaterialConstituentSet
-        constituent_set = ifc_file.create_entity("IfcMaterialConstituentSet")
-        constituent_set.Name = blender_material.name
-        
-        # Get constituent information
-        constituent_info_str = blender_material.get("constituent_info", "[]")
-        try:
-            constituent_info = eval(constituent_info_str) if isinstance(constituent_info_str, str) else constituent_info_str
-        except:
-            constituent_info = []
-        
-        # Create material constituents
-        material_constituents = []
-        created_materials = {}
-        
-        for constituent_data in constituent_info:
-            # Create or get material
-            material_name = constituent_data.get('material_name', 'Unknown')
-            if material_name not in created_materials:
-                material = ifc_file.create_entity("IfcMaterial")
-                material.Name = material_name
-                material.Category = constituent_data.get('category', '')
-                material.Description = constituent_data.get('description', '')
-                created_materials[material_name] = material
-            else:
-                material = created_materials[material_name]
-            
-            # Create material constituent
-            constituent = ifc_file.create_entity("IfcMaterialConstituent")
-            constituent.Material = material
-            constituent.Fraction = constituent_data.get('fraction', 0.0)
-            constituent.Name = constituent_data.get('name', material_name)
-            
-            material_constituents.append(constituent)
-        
-        constituent_set.MaterialConstituents = material_constituents
-        
-        print(f"[eLCA] Exported material constituent set: {blender_material.name}")
-        return constituent_set
-        
-    except Exception as e:
-        print(f"[eLCA] Error exporting material constituent set: {str(e)}")
-        return None
+        layer_info = _load_info(layer_info_str)
+    except:
+        layer_info = []
+    
+    # Create material layers, the list is filled by index as its length is known
+    material_layers = [None] * len(layer_info)
+    if material_cache is None:
+        material_cache = {}
+    
+    for i, layer_data in enumerate(layer_info):
+        get = layer_data.get
+        
+        # Create or get material
+        material_name = get('name', 'Unknown')
+        material = _export_material(ifc_file, material_cache, material_name,
+                                    get('category', ''), get('description', ''))
+        
+        # Create material layer
+        material_layers[i] = ifc_file.create_entity(
+            "IfcMaterialLayer", Material=material, LayerThickness=get('thickness', 0.0),
+            Name=material_name)
+    
+    layer_set.MaterialLayers = material_layers
+    
+    log.debug("Exported material layer set: %s", blender_material.name)
+    return layer_set
+
+def export_material_constituent_set_to_ifc(blender_material, ifc_file, material_cache=None):
+    """Export a Blender material constituent set to IFC
+    
+    Args:
+        blender_material: Blender material holding the constituent set data
+        ifc_file: IFC file to export to
+        material_cache: Optional materials already exported to ifc_file, shared between sets
+    """
+    # Create IfcMaterialConstituentSet
+    constituent_set = ifc_file.create_entity("IfcMaterialConstituentSet", Name=blender_material.name)
+    
+    # Get constituent information
+    constituent_info_str = blender_material.get("constituent_info", "[]")
+    try:
+        constituent_info = _load_info(constituent_info_str)
+    except:
+        constituent_info = []
+    
+    # Create material constituents, the list is filled by index as its length is known
+    material_constituents = [None] * len(constituent_info)
+    if material_cache is None:
+        material_cache = {}
+    
+    for i, constituent_data in enumerate(constituent_info):
+        get = constituent_data.get
+        
+        # Create or get material
+        material_name = get('material_name', 'Unknown')
+        material = _export_material(ifc_file, material_cache, material_name,
+                                    get('category', ''), get('description', ''))
+        
+        # Create material constituent
+        material_constituents[i] = ifc_file.create_entity(
+            "IfcMaterialConstituent", Material=material, Fraction=get('fraction', 0.0),
+            Name=get('name', material_name))
+    
+    constituent_set.MaterialConstituents = material_constituents
+    
+    log.debug("Exported material constituent set: %s", blender_material.name)
+    return constituent_set
+
+# eLCA keys set on every component material, the other 'elca_' keys hold environmental data
+_ELCA_COMPONENT_KEYS = frozenset(("elca_component", "elca_name", "elca_type"))
 
 def get_elca_materials_summary() -> Dict[str, Any]:
     """Get a summary of eLCA-specific materials in the project
@@ -923,21 +1162,33 @@ def get_elca_materials_summary() -> Dict[str, Any]:
         elca_elements = []
         
         for mat in bpy.data.materials:
-            if mat.get("elca_component", False):
+            get = mat.get
+            if get("elca_component", False):
+                # Materials created by earlier versions have no flag, their keys are scanned instead.
+                # The component's own eLCA keys don't count as environmental data.
+                has_environmental_data = get("_elca_has_env_component")
+                if has_environmental_data is None:
+                    has_environmental_data = any(key.startswith("elca_") and key not in _ELCA_COMPONENT_KEYS
+                                                 for key in mat.keys())
+                
                 elca_components.append({
                     'name': mat.name,
-                    'elca_name': mat.get("elca_name", ""),
-                    'elca_type': mat.get("elca_type", ""),
-                    'has_environmental_data': any(key.startswith("elca_") for key in mat.keys())
+                    'elca_name': get("elca_name", ""),
+                    'elca_type': get("elca_type", ""),
+                    'has_environmental_data': has_environmental_data
                 })
             
-            if mat.get("elca_element", False):
+            if get("elca_element", False):
+                has_environmental_data = get("_elca_has_env_element")
+                if has_environmental_data is None:
+                    has_environmental_data = any(key.startswith("elca_total_") for key in mat.keys())
+                
                 elca_elements.append({
                     'name': mat.name,
-                    'element_name': mat.get("elca_element_name", ""),
-                    'layer_count': mat.get("layer_count", 0),
-                    'total_thickness': mat.get("total_thickness", 0.0),
-                    'has_environmental_data': any(key.startswith("elca_total_") for key in mat.keys())
+                    'element_name': get("elca_element_name", ""),
+                    'layer_count': get("layer_count", 0),
+                    'total_thickness': get("total_thickness", 0.0),
+                    'has_environmental_data': has_environmental_data
                 })
         
         return {
@@ -961,18 +1212,35 @@ def cleanup_elca_materials() -> None:
                 materials_to_remove.append(mat)
         
         for mat in materials_to_remove:
-            print(f"[eLCA] Removing eLCA material: {mat.name}")
-            bpy.data.materials.remove(mat)
+            log.debug("Removing eLCA material: %s", mat.name)
+        bpy.data.batch_remove(materials_to_remove)
         
         print(f"[eLCA] Removed {len(materials_to_remove)} eLCA materials")
         
-        # Refresh interface after removal
-        refresh_bim_interface()
+        # Refresh interface after removal, nothing to redraw if no material was removed
+        if materials_to_remove:
+            refresh_bim_interface()
         
     except Exception as e:
         print(f"[eLCA] Error cleaning up eLCA materials: {str(e)}")
         traceback.print_exc()
 
+def _has_elca_property(material):
+    """Check whether an IFC material has an eLCA-related property
+    
+    Args:
+        material: IfcMaterial to check
+        
+    Returns:
+        True if one of the material's properties has 'elca' in its name
+    """
+    # HasProperties is missing in IFC2X3 and Properties on some property types
+    for prop_set in getattr(material, 'HasProperties', None) or ():
+        for prop in getattr(prop_set, 'Properties', None) or ():
+            if 'elca' in (prop.Name or '').lower():
+                return True
+    return False
+
 def import_materials_from_ifc_library(library_path: str, filter_elca: bool = False) -> bool:
     """Import materials from an IFC library file
     
@@ -989,27 +1257,18 @@ def import_materials_from_ifc_library(library_path: str, filter_elca: bool = Fal
             return False
         
         # Open the library file
-        library_ifc = ifcopenshell.open(library_path)
+        library_ifc = open_library_file(library_path)
         
         # Import material sets
         add_material_sets_to_project(library_ifc)
         
         # If filtering for eLCA materials, also look for materials with eLCA properties
         if filter_elca:
-            materials = library_ifc.by_type("IfcMaterial")
-            elca_materials = []
-            
-            for material in materials:
-                # Check if material has eLCA-related properties
-                if hasattr(material, 'HasProperties') and material.HasProperties:
-                    for prop_set in material.HasProperties:
-                        if hasattr(prop_set, 'Properties'):
-                            for prop in prop_set.Properties:
-                                if hasattr(prop, 'Name') and 'elca' in prop.Name.lower():
-                                    elca_materials.append(material)
-                                    break
+            # Only the number is reported, so count without collecting the materials
+            elca_material_count = sum(1 for material in library_ifc.by_type("IfcMaterial")
+                                      if _has_elca_property(material))
             
-            print(f"[eLCA] Found {len(elca_materials)} materials with eLCA properties")
+            print(f"[eLCA] Found {elca_material_count} materials with eLCA properties")
         
         print(f"[eLCA] Successfully imported materials from library: {library_path}")
         return True
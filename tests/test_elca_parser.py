@@ -0,0 +1,251 @@
+"""Tests for the eLCA HTML report and XML project file parser.
+
+Run from the repository root with:
+    python -m unittest discover -s tests
+"""
+import contextlib
+import io
+import logging
+import math
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# The add-on package imports bpy, so the parser module is imported on its own
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import elca_parser
+
+# Keep the parser's warnings out of the test output, tests that expect them use assertLogs
+logging.getLogger("elca").addHandler(logging.NullHandler())
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+REPORT_HTML = FIXTURES / "report.html"
+PROJECT_XML = FIXTURES / "project.xml"
+# Output of the parser before the performance changes for report.html, kept to check
+# that the detail and summary CSV files did not change
+EXPECTED_DETAIL_CSV = FIXTURES / "report_detail.csv"
+EXPECTED_SUMMARY_CSV = FIXTURES / "report_summary.csv"
+
+def make_extractor(html_path=REPORT_HTML, xml_path=None):
+    """Create an extractor without printing its load messages"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return elca_parser.ELCAComponentExtractor(html_path, xml_path)
+
+def read_text(path):
+    """Read a text file with universal newlines"""
+    with open(path, encoding='utf-8') as file:
+        return file.read()
+
+def write_report(directory, html):
+    """Write an HTML report into directory and return its path"""
+    path = Path(directory) / 'report.html'
+    path.write_text(html, encoding='utf-8')
+    return path
+
+def layer_values(df):
+    """Get (bauteil, component, thickness, position) of each component row in a detail DataFrame
+    
+    Process rows repeat their component, only the first row of each component is kept.
+    Missing values are returned as None.
+    """
+    columns = ['Bauteil Name', 'Component Number', 'Component Name', 'Layer Thickness', 'Layer Position']
+    values = []
+    for bauteil, number, name, thickness, position in df[columns].drop_duplicates(columns[:3]).values:
+        if isinstance(thickness, float) and math.isnan(thickness):
+            thickness = None
+        if isinstance(position, float) and math.isnan(position):
+            position = None
+        values.append((bauteil, name, thickness, position))
+    return values
+
+class BaselineOutputTest(unittest.TestCase):
+    """Detail and summary output compared with the output of earlier versions"""
+
+    def setUp(self):
+        self.extractor = make_extractor()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_detail_dataframe_matches_baseline(self):
+        self.assertEqual(self.extractor.to_dataframe().to_csv(index=False),
+                         read_text(EXPECTED_DETAIL_CSV))
+
+    def test_detail_csv_matches_baseline(self):
+        path = Path(self.directory.name) / 'detail.csv'
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.extractor.save_to_csv(path)
+        self.assertEqual(read_text(path), read_text(EXPECTED_DETAIL_CSV))
+
+    def test_summary_csv_matches_baseline(self):
+        path = Path(self.directory.name) / 'summary.csv'
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.extractor.save_bauteil_summary_to_csv(path)
+        self.assertEqual(read_text(path), read_text(EXPECTED_SUMMARY_CSV))
+
+    def test_summary_csv_matches_pandas(self):
+        # The summary is written with the csv module, byte for byte like DataFrame.to_csv
+        path = Path(self.directory.name) / 'summary.csv'
+        pandas_path = Path(self.directory.name) / 'summary_pandas.csv'
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.extractor.save_bauteil_summary_to_csv(path)
+        self.extractor.get_bauteil_summary_dataframe().to_csv(pandas_path, index=False, encoding='utf-8')
+        self.assertEqual(path.read_bytes(), pandas_path.read_bytes())
+
+    def test_empty_summary_csv_matches_pandas(self):
+        html_path = write_report(self.directory.name, '<html><body><ul class="category"></ul></body></html>')
+        extractor = make_extractor(html_path)
+        path = Path(self.directory.name) / 'summary.csv'
+        pandas_path = Path(self.directory.name) / 'summary_pandas.csv'
+        with contextlib.redirect_stdout(io.StringIO()):
+            extractor.save_bauteil_summary_to_csv(path)
+        extractor.get_bauteil_summary_dataframe().to_csv(pandas_path, index=False, encoding='utf-8')
+        self.assertEqual(path.read_bytes(), pandas_path.read_bytes())
+
+    def test_component_cells_with_extra_classes(self):
+        # The number and details cells are found by class in a single pass over the cells
+        components = self.extractor.extract_bauteil_elements()[0].components
+        self.assertEqual(components[1]['number'], '2.')
+        self.assertEqual(components[1]['name'], 'Mineralwolle')
+        self.assertEqual(components[1]['quantity_value'], 120.0)
+        self.assertEqual(components[1]['quantity_unit'], 'mm')
+
+    def test_single_cell_is_number_and_details_cell(self):
+        # A component row with one cell uses it for both the number and the details
+        html_path = write_report(self.directory.name, (
+            '<ul class="category"><li class="section"><h1>331 Wände</h1><ul class="report-elements">'
+            '<li class="section"><h2><a class="page" href="/1/">Wand</a></h2>'
+            '<div class="element-assets"><h3>Schichten</h3><table><tbody>'
+            '<tr class="component"><td class="firstColumn lastColumn">'
+            '<span class="process-config-name">Putz</span></td></tr>'
+            '</tbody></table></div></li></ul></li></ul>'))
+        component = make_extractor(html_path).extract_bauteil_elements()[0].components[0]
+        self.assertEqual(component['number'], 'Putz')
+        self.assertEqual(component['name'], 'Putz')
+
+    def test_details_row_must_follow_its_component(self):
+        # Earlier versions took the next details row anywhere after the component, so a
+        # component without details got the processes of the following component
+        html_path = write_report(self.directory.name, (
+            '<ul class="category"><li class="section"><h1>331 Wände</h1><ul class="report-elements">'
+            '<li class="section"><h2><a class="page" href="/1/">Wand</a></h2>'
+            '<div class="element-assets"><h3>Schichten</h3><table><tbody>'
+            '<tr class="component"><td class="firstColumn">1.</td><td class="lastColumn">'
+            '<span class="process-config-name">Putz</span></td></tr>'
+            '<tr class="component"><td class="firstColumn">2.</td><td class="lastColumn">'
+            '<span class="process-config-name">Ziegel</span></td></tr>'
+            '<tr class="details"><td><table class="report-assets-details"><tbody>'
+            '<tr><td>A1-3</td><td>100%</td><td>Ziegel</td><td>1 kg</td><td>uuid-ziegel</td></tr>'
+            '</tbody></table></td></tr>'
+            '</tbody></table></div></li></ul></li></ul>'))
+        components = make_extractor(html_path).extract_bauteil_elements()[0].components
+        self.assertNotIn('lifecycle_processes', components[0])
+        self.assertEqual([process['uuid'] for process in components[1]['lifecycle_processes']],
+                         ['uuid-ziegel'])
+
+class XMLLayerDataTest(unittest.TestCase):
+    """Layer data read from the XML project file"""
+
+    def setUp(self):
+        self.extractor = make_extractor(None, PROJECT_XML)
+
+    def test_entries_keyed_by_element_and_component(self):
+        # Components without a UUID are keyed by their name
+        self.assertEqual(list(self.extractor.xml_layer_data),
+                         ['el-a_co-a-1', 'el-a_co-a-2', 'el-b_co-b-1', 'el-d_Stahlbeton'])
+        layer = self.extractor.xml_layer_data['el-a_co-a-1']
+        self.assertEqual(layer['component_name'], 'Kalksandstein')
+        self.assertEqual(layer['layer_thickness'], 0.175)
+        self.assertEqual(layer['element_name'], 'Außenwand A')
+
+    def test_duplicate_names_index_last_component(self):
+        # 'Kalksandstein' is used in two elements, the later one wins like the
+        # name aliases earlier versions stored in xml_layer_data
+        self.assertEqual(self.extractor.name_index,
+                         {'Kalksandstein': 'el-b_co-b-1',
+                          'Mineralwolle': 'el-a_co-a-2',
+                          'Stahlbeton': 'el-d_Stahlbeton'})
+
+    def test_invalid_layer_size_is_skipped(self):
+        with self.assertLogs('elca.parser', 'WARNING') as logs:
+            extractor = make_extractor(None, PROJECT_XML)
+        self.assertIn('Invalid layer size value: dünn for component co-d-2', logs.output[0])
+        self.assertNotIn('el-d_co-d-2', extractor.xml_layer_data)
+
+    def test_layer_thickness_summary_counts_each_component_once(self):
+        self.assertEqual(self.extractor.get_layer_thickness_summary(),
+                         {'total_elements': 3, 'total_layers': 4, 'total_components': 0, 'total_entries': 4})
+
+    def test_reload_rebuilds_the_index(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.extractor.reload()
+        self.assertEqual(len(self.extractor.xml_layer_data), 4)
+        self.assertEqual(self.extractor.name_index['Kalksandstein'], 'el-b_co-b-1')
+
+class LayerJoinTest(unittest.TestCase):
+    """XML layer data joined into the detail DataFrame"""
+
+    def test_layer_columns_only_with_xml(self):
+        columns = list(make_extractor().to_dataframe().columns)
+        self.assertNotIn('Layer Thickness', columns)
+        self.assertNotIn('Layer Position', columns)
+        
+        columns = list(make_extractor(xml_path=PROJECT_XML).to_dataframe().columns)
+        component_end = columns.index('Component Lifetime')
+        self.assertEqual(columns[component_end + 1:component_end + 3], ['Layer Thickness', 'Layer Position'])
+
+    def test_repeated_names_join_their_own_element(self):
+        # 'Kalksandstein' is used in both walls with different thicknesses
+        df = make_extractor(xml_path=PROJECT_XML).to_dataframe()
+        self.assertEqual(layer_values(df), [
+            ('Außenwand A', 'Kalksandstein', 0.175, '1'),
+            ('Außenwand A', 'Mineralwolle', 0.12, '2'),
+            ('Außenwand B', 'Kalksandstein', 0.24, '1'),
+            ('Flachdach', 'Stahlbeton', 0.0, None),
+            ('Flachdach', 'Bitumenbahn', None, None),
+        ])
+
+    def test_repeated_names_within_an_element_join_in_order(self):
+        html = (
+            '<ul class="category"><li class="section"><h1>331 Wände</h1><ul class="report-elements">'
+            '<li class="section"><h2><a class="page" href="/1/">Sandwich</a></h2>'
+            '<div class="element-assets"><h3>Schichten</h3><table><tbody>'
+            '<tr class="component"><td class="firstColumn">1.</td><td class="lastColumn">'
+            '<span class="process-config-name">Putz</span></td></tr>'
+            '<tr class="component"><td class="firstColumn">2.</td><td class="lastColumn">'
+            '<span class="process-config-name">Ziegel</span></td></tr>'
+            '<tr class="component"><td class="firstColumn">3.</td><td class="lastColumn">'
+            '<span class="process-config-name">Putz</span></td></tr>'
+            '</tbody></table></div></li>'
+            '<li class="section"><h2><a class="page" href="/2/">Unbekannt</a></h2>'
+            '<div class="element-assets"><h3>Schichten</h3><table><tbody>'
+            '<tr class="component"><td class="firstColumn">1.</td><td class="lastColumn">'
+            '<span class="process-config-name">Ziegel</span></td></tr>'
+            '</tbody></table></div></li></ul></li></ul>'
+        )
+        xml = (
+            '<elca xmlns="https://www.bauteileditor.de"><element uuid="e1">'
+            '<elementInfo><name>Sandwich</name></elementInfo><components>'
+            '<component uuid="c1" isLayer="true" layerSize="0.015" layerPosition="1" processConfigName="Putz"/>'
+            '<component uuid="c2" isLayer="true" layerSize="0.24" layerPosition="2" processConfigName="Ziegel"/>'
+            '<component uuid="c3" isLayer="true" layerSize="0.02" layerPosition="3" processConfigName="Putz"/>'
+            '</components></element></elca>'
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            html_path = write_report(directory, html)
+            xml_path = Path(directory) / 'project.xml'
+            xml_path.write_text(xml, encoding='utf-8')
+            df = make_extractor(html_path, xml_path).to_dataframe()
+        
+        # 'Unbekannt' has no XML element and falls back to the component name
+        self.assertEqual(layer_values(df), [
+            ('Sandwich', 'Putz', 0.015, '1'),
+            ('Sandwich', 'Ziegel', 0.24, '2'),
+            ('Sandwich', 'Putz', 0.02, '3'),
+            ('Unbekannt', 'Ziegel', 0.24, '2'),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
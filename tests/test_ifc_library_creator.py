@@ -0,0 +1,105 @@
+"""Tests for creating IFC material libraries from eLCA building elements.
+
+Run from the repository root with:
+    python -m unittest discover -s tests
+"""
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# The add-on package imports bpy, so the modules are imported on their own
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from elca_parser import BauteilElement, parse_quantity
+import ifc_library_creator
+
+def process(name, uuid):
+    """Create a lifecycle process as extracted from an eLCA report"""
+    return {'lifecycle_phase': 'A1-3', 'ratio': '100%', 'process_name': name,
+            'reference_value': '1 kg', 'uuid': uuid}
+
+def component(name=None, processes=(), category='Schichten'):
+    """Create a component as extracted from an eLCA report"""
+    data = {'component_category': category, 'quantity': '100,00 mm'}
+    if name is not None:
+        data['name'] = name
+    if processes:
+        data['lifecycle_processes'] = list(processes)
+    return data
+
+def create_library(elements):
+    """Create a library file from elements and return the IFC file"""
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        return ifc_library_creator.create_ifc_library_from_bauteil_elements(
+            elements, str(Path(directory) / 'library.ifc'))
+
+def material_processes(ifc_file):
+    """Map each IfcMaterial to the Oekobaudat UUIDs attached to it"""
+    uuids = {material.id(): [] for material in ifc_file.by_type('IfcMaterial')}
+    for pset in ifc_file.by_type('IfcMaterialProperties'):
+        uuids[pset.Material.id()].append(pset.Properties[0].NominalValue.wrappedValue)
+    return sorted((ifc_file.by_id(material_id).Name, sorted(values)) for material_id, values in uuids.items())
+
+def parsed_component(quantity):
+    """Create a component with the quantity value and unit the parser splits off"""
+    data = component('Putz')
+    data['quantity'] = quantity
+    value, unit = parse_quantity(quantity)
+    if value is not None:
+        data['quantity_value'] = value
+        data['quantity_unit'] = unit
+    return data
+
+class ComponentThicknessTest(unittest.TestCase):
+    """Layer thickness in meters from the quantity of a component"""
+
+    def test_units(self):
+        self.assertAlmostEqual(ifc_library_creator.component_thickness(parsed_component('175,00 mm')), 0.175)
+        self.assertAlmostEqual(ifc_library_creator.component_thickness(parsed_component('2,5 cm')), 0.025)
+        self.assertAlmostEqual(ifc_library_creator.component_thickness(parsed_component('0,25 m')), 0.25)
+        self.assertAlmostEqual(ifc_library_creator.component_thickness(parsed_component('120')), 0.12)
+
+    def test_unit_without_space_uses_default(self):
+        # Like the quantity text split on whitespace, '12,5m' is not a number
+        self.assertEqual(parse_quantity('12,5m'), (None, ''))
+        self.assertEqual(ifc_library_creator.component_thickness(parsed_component('12,5m')), 0.01)
+
+class MaterialSharingTest(unittest.TestCase):
+    """IfcMaterial entities shared between the layers of different elements"""
+
+    def test_same_material_is_created_once(self):
+        ks = component('Kalksandstein', [process('Kalksandstein', 'uuid-ks')])
+        ifc_file = create_library([
+            BauteilElement('331', 'Außenwände', name='Wand A', components=[ks]),
+            BauteilElement('331', 'Außenwände', name='Wand B', components=[dict(ks)]),
+        ])
+        self.assertEqual(material_processes(ifc_file), [('Kalksandstein', ['uuid-ks'])])
+        self.assertEqual(len(ifc_file.by_type('IfcMaterialLayer')), 2)
+
+    def test_same_name_with_other_processes_keeps_its_properties(self):
+        ifc_file = create_library([
+            BauteilElement('331', 'Außenwände', name='Wand A',
+                           components=[component('Dämmung', [process('Mineralwolle', 'uuid-mw')])]),
+            BauteilElement('331', 'Außenwände', name='Wand B',
+                           components=[component('Dämmung', [process('Holzfaser', 'uuid-hf')])]),
+        ])
+        self.assertEqual(material_processes(ifc_file),
+                         [('Dämmung', ['uuid-hf']), ('Dämmung', ['uuid-mw'])])
+
+    def test_unnamed_components_are_not_merged(self):
+        # Both components get the fallback name 'Component_0'
+        ifc_file = create_library([
+            BauteilElement('331', 'Außenwände', name='Wand A',
+                           components=[component(processes=[process('Lehm', 'uuid-lehm')])]),
+            BauteilElement('331', 'Außenwände', name='Wand B',
+                           components=[component(processes=[process('Kalkputz', 'uuid-kalk')])]),
+        ])
+        self.assertEqual(material_processes(ifc_file),
+                         [('Component_0', ['uuid-kalk']), ('Component_0', ['uuid-lehm'])])
+
+if __name__ == '__main__':
+    unittest.main()